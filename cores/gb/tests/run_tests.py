@@ -30,25 +30,62 @@ Detection (declared per test in test_config.json; see its known_issues):
 
 from __future__ import annotations
 
-import io
+import os
 import sys
-import urllib.request
-import zipfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 # cores/gb/tests -> repo root (parents[2]); shared testkit lives in <root>/tests
 sys.path.insert(0, str(SCRIPT_DIR.parents[2] / "tests"))
 
 from veloce_testkit.runner import run_console_main  # noqa: E402
+from veloce_testkit.schema import load_config  # noqa: E402
+from veloce_testkit.util import cache_dir  # noqa: E402
 
 BUNDLE_URL = (
     "https://github.com/c-sp/gameboy-test-roms/releases/download/"
     "v7.0/game-boy-test-roms-v7.0.zip"
 )
-# A directory that always exists in the bundle -- used as the "already unpacked"
-# sentinel so we do not re-download on every run.
+# A directory that always exists in the bundle -- always unpacked, so there is
+# an "already unpacked" marker even for a config that does not use it.
 SENTINEL = "blargg"
+COPY_BUFSIZE = 1 << 20
+
+
+def _bundle_cache() -> Path:
+    """Where the downloaded bundle is kept between runs (and checkouts).
+
+    Named after the release asset, so a new BUNDLE_URL version gets its own file.
+    """
+    return cache_dir() / BUNDLE_URL.rsplit("/", 1)[1]
+
+
+def _config_top_dirs(script_dir: Path) -> set[str]:
+    """Top-level bundle directories referenced by test_config.json."""
+    cfg = load_config(script_dir / "test_config.json", "gb")
+    dirs = {SENTINEL}
+    for suite in cfg.suites:
+        for t in suite.tests:
+            parts = PurePosixPath(t.file).parts if t.file else ()
+            if len(parts) > 1:
+                dirs.add(parts[0])
+    return dirs
+
+
+def _extract(bundle, roms_dir: Path, wanted: set[str]) -> None:
+    """Unpack only the bundle entries under the `wanted` top-level dirs."""
+    import shutil
+    import zipfile
+
+    with zipfile.ZipFile(bundle) as zf:
+        for info in zf.infolist():
+            parts = PurePosixPath(info.filename).parts
+            if info.is_dir() or not parts or parts[0] not in wanted or ".." in parts:
+                continue
+            dest = roms_dir.joinpath(*parts)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            with zf.open(info) as src, open(dest, "wb") as out:
+                shutil.copyfileobj(src, out, COPY_BUFSIZE)
 
 
 def rom_provider(script_dir: Path, keep: bool, verbose: bool) -> Path:
@@ -56,20 +93,51 @@ def rom_provider(script_dir: Path, keep: bool, verbose: bool) -> Path:
 
     The bundle is unpacked into <script_dir>/roms/. Per-test `file` paths are
     relative to that root (e.g. blargg/cpu_instrs/individual/01-special.gb).
+    Only the top-level directories the config references are extracted; a
+    config that starts using another one re-extracts from the bundle, which is
+    downloaded once and then kept in the user cache (see _bundle_cache). A
+    corrupt cached bundle is deleted, so the next run downloads it again.
     """
     roms_dir = script_dir / "roms"
     roms_dir.mkdir(exist_ok=True)
 
-    if (roms_dir / SENTINEL).is_dir():
+    wanted = _config_top_dirs(script_dir)
+    if all((roms_dir / d).is_dir() for d in wanted):
         return roms_dir
 
-    if verbose:
-        print(f"  downloading {BUNDLE_URL}")
+    # Only a first run downloads; keep urllib/ssl off the common startup path.
+    import shutil
+    import tempfile
+    import urllib.request
+    import zipfile
+
+    bundle = _bundle_cache()
     try:
-        with urllib.request.urlopen(BUNDLE_URL, timeout=300) as resp:
-            data = resp.read()
-        with zipfile.ZipFile(io.BytesIO(data)) as zf:
-            zf.extractall(roms_dir)
+        if not bundle.is_file():
+            if verbose:
+                print(f"  downloading {BUNDLE_URL}")
+            bundle.parent.mkdir(parents=True, exist_ok=True)
+            # Stream into a temp file beside the cache entry with 1 MiB copies,
+            # then rename: an interrupted download never looks complete.
+            tmp = tempfile.NamedTemporaryFile(dir=bundle.parent, suffix=".part", delete=False)
+            try:
+                with tmp, urllib.request.urlopen(BUNDLE_URL, timeout=300) as resp:
+                    shutil.copyfileobj(resp, tmp, COPY_BUFSIZE)
+                os.replace(tmp.name, bundle)
+            except BaseException:
+                Path(tmp.name).unlink(missing_ok=True)
+                raise
+        elif verbose:
+            print(f"  using cached {bundle}")
+        try:
+            _extract(bundle, roms_dir, wanted)
+        except zipfile.BadZipFile:
+            bundle.unlink(missing_ok=True)
+            raise
+        # A directory the bundle lacks is not worth a download on every run;
+        # its tests SKIP with "ROM not found" instead.
+        for d in wanted:
+            (roms_dir / d).mkdir(exist_ok=True)
     except Exception as e:  # noqa: BLE001
         print(
             f"  ERROR: could not fetch/unpack the test-rom bundle: {e}\n"
@@ -114,6 +114,8 @@ private:
 
     // Test ROM result tracking (for DEBUG mode)
     bool m_test_result_reported = false;
+    uint32_t m_test_last_pc = 0;
+    int m_test_same_pc_frames = 0;
 
     // File extensions
     static const char* s_extensions[];
@@ -214,6 +216,8 @@ void GBAPlugin::unload_rom() {
     m_total_cycles = 0;
     m_frame_count = 0;
     m_test_result_reported = false;
+    m_test_last_pc = 0;
+    m_test_same_pc_frames = 0;
 
     m_cpu.reset();
     m_bus.reset();
@@ -233,6 +237,8 @@ void GBAPlugin::reset() {
     m_frame_count = 0;
     m_audio_samples = 0;
     m_test_result_reported = false;
+    m_test_last_pc = 0;
+    m_test_same_pc_frames = 0;
 
     if (m_cpu) m_cpu->reset();
     if (m_ppu) m_ppu->reset();
@@ -298,20 +304,17 @@ void GBAPlugin::run_gba_frame(const emu::InputState& input) {
 
     // Test ROM result detection (frame-based)
     if (is_debug_mode() && !m_test_result_reported) {
-        static uint32_t last_frame_pc = 0;
-        static int same_pc_frames = 0;
-
         uint32_t current_pc = m_cpu->get_pc();
 
-        if (current_pc == last_frame_pc) {
-            same_pc_frames++;
+        if (current_pc == m_test_last_pc) {
+            m_test_same_pc_frames++;
             // If PC has been the same for 10 frames (~170ms), consider test complete
-            if (same_pc_frames >= 10) {
+            if (m_test_same_pc_frames >= 10) {
                 uint32_t r12 = m_cpu->get_register(12);
                 m_test_result_reported = true;
 
                 fprintf(stderr, "\n=== GBA TEST ROM RESULT ===\n");
-                fprintf(stderr, "Detected stable PC at 0x%08X for %d frames\n", current_pc, same_pc_frames);
+                fprintf(stderr, "Detected stable PC at 0x%08X for %d frames\n", current_pc, m_test_same_pc_frames);
                 fprintf(stderr, "R12 (test result): %u\n", r12);
                 fprintf(stderr, "Cycles: %llu, Frame: %llu\n",
                        static_cast<unsigned long long>(m_total_cycles),
@@ -326,8 +329,8 @@ void GBAPlugin::run_gba_frame(const emu::InputState& input) {
                 fflush(stderr);  // Ensure output is flushed immediately for test detection
             }
         } else {
-            same_pc_frames = 0;
-            last_frame_pc = current_pc;
+            m_test_same_pc_frames = 0;
+            m_test_last_pc = current_pc;
         }
     }
 
@@ -20,9 +20,12 @@ Usage:
 
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
 # Make the shared testkit importable: cores/gba/tests -> repo root / tests
 _REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -52,24 +55,52 @@ from veloce_testkit.schema import load_config        # noqa: E402
 # arm/arm.gba) the per-suite repo dir disambiguates via a merged view built here.
 
 
+def _iter_roms(root: Path) -> Iterator[tuple[str, str]]:
+    """(path, root-relative path) of *.gba files under root, like rglob("*.gba").
+
+    The relative path is built while descending, so callers need no
+    relative_to(). Directory symlinks are not followed (as with rglob) and
+    .git is skipped.
+    """
+    stack = [(str(root), "")]
+    while stack:
+        top, rel = stack.pop()
+        with os.scandir(top) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != ".git":
+                        stack.append((entry.path, rel + entry.name + "/"))
+                elif entry.name.endswith(".gba"):
+                    yield entry.path, rel + entry.name
+
+
 def _ensure_repos(script_dir: Path, keep: bool, verbose: bool) -> Path:
     cfg = load_config(script_dir / "test_config.json", "gba")
     merged = script_dir / "_roms"
     merged.mkdir(exist_ok=True)
 
+    def clone(repo_id: str, url: str, rdir: Path) -> None:
+        if verbose:
+            print(f"cloning {repo_id}: {url}")
+        try:
+            subprocess.run(
+                ["git", "clone", "--depth", "1", url, str(rdir)],
+                check=True, capture_output=not verbose,
+            )
+        except subprocess.CalledProcessError as e:
+            print(f"  warn: failed to clone {repo_id}: {e}", file=sys.stderr)
+
+    missing = []
     for repo_id, repo in cfg.repositories.items():
         url = repo.get("url")
         rdir = script_dir / repo.get("dir", repo_id)
         if not rdir.exists() and url:
-            if verbose:
-                print(f"cloning {repo_id}: {url}")
-            try:
-                subprocess.run(
-                    ["git", "clone", "--depth", "1", url, str(rdir)],
-                    check=True, capture_output=not verbose,
-                )
-            except subprocess.CalledProcessError as e:
-                print(f"  warn: failed to clone {repo_id}: {e}", file=sys.stderr)
+            missing.append((repo_id, url, rdir))
+    # The repos are independent and a clone is network-bound: fetch them all
+    # at once rather than one after another.
+    if missing:
+        with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+            list(pool.map(clone, *zip(*missing)))
 
     # Build a per-repo merged view: a test's 'file' is resolved against the
     # repo dir of its suite. The testkit resolves against a single roms_dir, so
@@ -84,14 +115,13 @@ def _ensure_repos(script_dir: Path, keep: bool, verbose: bool) -> Path:
         rdir = script_dir / cfg.repositories.get(repo_id, {}).get("dir", repo_id)
         if not rdir.exists():
             continue
-        for src in rdir.rglob("*.gba"):
-            rel = src.relative_to(rdir)
+        for src, rel in _iter_roms(rdir):
             dst = merged / rel
             if dst.exists():
                 continue
             dst.parent.mkdir(parents=True, exist_ok=True)
             try:
-                dst.symlink_to(src.resolve())
+                dst.symlink_to(os.path.realpath(src))
             except OSError:
                 import shutil
                 shutil.copy2(src, dst)
@@ -17,6 +17,7 @@ Usage:
     python test_runner.py thumb        # Run Thumb instruction tests only
     python test_runner.py --keep       # Keep test ROMs after completion
     python test_runner.py --json       # Output results as JSON
+    python test_runner.py -j 8         # Run up to 8 emulator processes at once
 
 Test Result Detection:
     The emulator outputs debug messages with [GBA] prefix:
@@ -26,18 +27,52 @@ Test Result Detection:
     - Timeout or crash indicates failure
 """
 
-import argparse
 import json
 import os
 import re
-import shutil
 import subprocess
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
+# Make the shared testkit importable: cores/gba/tests -> repo_root/tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "tests"))
+
+from veloce_testkit.util import write_json  # noqa: E402
+
+# Result patterns, compiled once rather than per test
+_RE_GBA_FAILED_AT = re.compile(r"\[GBA\] FAILED.*?test\s*#?(\d+)")
+_RE_FAILED_TEST = re.compile(r"failed test\s*#?(\d+)")
+# Printed by the emulator once a PNG is on disk (std::filesystem::path quotes it)
+_RE_SCREENSHOT_SAVED = re.compile(r'^\[Screenshot\] Saved: "?(.+?)"?$', re.M)
+
+# Category names map to the canonical "subsystem" key of each suite (v2),
+# plus a few convenience aliases that map to specific suite ids.
+_SUBSYSTEM_FILTERS = frozenset({"cpu", "ppu", "timing", "memory", "mapper", "apu", "misc"})
+_CATEGORY_ALIASES = {
+    "arm": ["cpu_arm", "cpu_alyosha_core"],
+    "thumb": ["cpu_thumb", "cpu_alyosha_core"],
+    "fuzz": ["cpu_fuzz"],
+    "psr": ["cpu_psr"],
+    "ldm": ["cpu_ldm"],
+    "prefetch": ["prefetch"],
+    "irq": ["timing_irq", "timing_irq_nba"],
+    "dma": ["timing_dma", "timing_dma_nba"],
+    "fifo": ["timing_fifo_dma"],
+    "timer": ["timing_timer", "timing_timer_nba"],
+    "haltcnt": ["timing_haltcnt"],
+    "interactions": ["timing_interactions"],
+    "bus": ["memory_bus"],
+    "bios": ["bios", "bios_alyosha"],
+    "save": ["save"],
+    "unsafe": ["memory_unsafe"],
+    "ppu": ["ppu"],  # also handled by the subsystem filter
+}
+
 
 class TestResult(Enum):
     PASS = "pass"
@@ -53,7 +88,7 @@ class TestType(Enum):
     VISUAL = "visual"  # Requires visual verification (screenshot)
 
 
-@dataclass
+@dataclass(slots=True)
 class TestCase:
     """Represents a single test ROM."""
     name: str
@@ -69,39 +104,56 @@ class TestCase:
     failed_test_number: Optional[int] = None
     screenshot_frame: int = 300  # Frame to capture screenshot for visual tests
     screenshot_path: Optional[Path] = None  # Path to captured screenshot
+    is_save_test: bool = field(init=False, default=False)  # derived from path
+
+    def __post_init__(self):
+        self.is_save_test = "save" in str(self.path).lower()
 
 
-@dataclass
+@dataclass(slots=True)
 class TestSuite:
     """Represents a collection of related tests."""
     name: str
     description: str
     priority: str
     tests: list[TestCase] = field(default_factory=list)
+    _counts: Optional[Counter] = field(default=None, init=False, repr=False, compare=False)
+
+    def tally(self) -> Counter:
+        """Count results in one pass; call again after results change."""
+        self._counts = Counter(t.result for t in self.tests)
+        return self._counts
+
+    def counts(self) -> Counter:
+        """Per-result counts, tallied on first use."""
+        return self._counts if self._counts is not None else self.tally()
+
+    def _count(self, result: TestResult) -> int:
+        return self.counts()[result]
 
     @property
     def passed(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.PASS)
+        return self._count(TestResult.PASS)
 
     @property
     def failed(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.FAIL)
+        return self._count(TestResult.FAIL)
 
     @property
     def known_fails(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.KNOWN_FAIL)
+        return self._count(TestResult.KNOWN_FAIL)
 
     @property
     def skipped(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.SKIP)
+        return self._count(TestResult.SKIP)
 
     @property
     def timeouts(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.TIMEOUT)
+        return self._count(TestResult.TIMEOUT)
 
     @property
     def visual(self) -> int:
-        return sum(1 for t in self.tests if t.result == TestResult.VISUAL)
+        return self._count(TestResult.VISUAL)
 
 
 class Colors:
@@ -128,10 +180,15 @@ class GBATestRunner:
         keep_roms: bool = False,
         verbose: bool = False,
         json_output: bool = False,
+        jobs: int = 1,
     ):
         self.keep_roms = keep_roms
         self.verbose = verbose
         self.json_output = json_output
+        # Tests are independent emulator processes (distinct ROM, save file and
+        # screenshot names), so within a suite they can run side by side.
+        self.jobs = max(1, jobs)
+        self._pool: Optional[ThreadPoolExecutor] = None
         self.script_dir = Path(__file__).parent
         self.project_root = self.script_dir.parent.parent.parent
         self.screenshots_dir = self.script_dir / "screenshots"
@@ -142,9 +199,31 @@ class GBATestRunner:
         self.TIMEOUT_SECONDS = self.config.get("timeout_seconds", 60)
         self.suites: list[TestSuite] = []
         self.repo_dirs: dict[str, Path] = {}  # Maps repo name -> local path
+        # Environment shared by every test; run_test copies it and adds FRAMES etc.
+        self._base_env = os.environ.copy()
+        self._base_env["DEBUG"] = "1"
+        self._base_env["HEADLESS"] = "1"
 
         if json_output:
             Colors.disable()
+        # Output templates, built once now that the color choice is final
+        self._symbols = {
+            TestResult.PASS: f"{Colors.GREEN}PASS{Colors.NC}",
+            TestResult.FAIL: f"{Colors.RED}FAIL{Colors.NC}",
+            TestResult.KNOWN_FAIL: f"{Colors.YELLOW}KNOWN{Colors.NC}",
+            TestResult.TIMEOUT: f"{Colors.YELLOW}TIMEOUT{Colors.NC}",
+            TestResult.SKIP: f"{Colors.YELLOW}SKIP{Colors.NC}",
+            TestResult.VISUAL: f"{Colors.CYAN}VISUAL{Colors.NC}",
+        }
+        # (suite attribute, template, shown even when zero)
+        self._summary_fields = [
+            ("passed", f"{Colors.GREEN}Passed: {{}}{Colors.NC}", True),
+            ("failed", f"{Colors.RED}Failed: {{}}{Colors.NC}", True),
+            ("known_fails", f"{Colors.YELLOW}Known: {{}}{Colors.NC}", False),
+            ("visual", f"{Colors.CYAN}Visual: {{}}{Colors.NC}", False),
+            ("timeouts", f"{Colors.YELLOW}Timeout: {{}}{Colors.NC}", False),
+            ("skipped", "Skipped: {}", False),
+        ]
 
     def _find_emulator(self) -> Path:
         """Find the veloce emulator binary."""
@@ -227,7 +306,14 @@ class GBATestRunner:
             if repo_path.exists():
                 if not self.json_output:
                     print(f"\n{Colors.BLUE}Cleaning up {repo_name} test ROMs...{Colors.NC}")
-                shutil.rmtree(repo_path)
+                # A ROM checkout is thousands of small files; coreutils rm -rf
+                # unlinks them without shutil.rmtree's per-entry Python overhead.
+                if sys.platform != "win32":
+                    subprocess.run(["rm", "-rf", str(repo_path)], check=True)
+                else:
+                    import shutil
+
+                    shutil.rmtree(repo_path)
 
     def run_test(self, test: TestCase) -> TestResult:
         """Run a single test ROM through Veloce and determine the result."""
@@ -247,7 +333,7 @@ class GBATestRunner:
 
         # For save tests, clean up existing save files to ensure fresh state
         # Save tests require blank memory to pass correctly
-        if "save" in str(test.path).lower():
+        if test.is_save_test:
             save_dir = self.project_root / "saves"
             save_file = save_dir / f"{rom_path.stem}.sav"
             if save_file.exists():
@@ -256,7 +342,7 @@ class GBATestRunner:
         # Build command - run veloce in headless mode with DEBUG=1
         # Use more frames for save tests which require multiple erase/write cycles
         frame_limit = self.config.get("frame_limit", 300)
-        if "save" in str(test.path).lower():
+        if test.is_save_test:
             frame_limit = max(frame_limit, 1000)  # Save tests need more frames
 
         # Visual tests may need more frames and a screenshot
@@ -264,16 +350,12 @@ class GBATestRunner:
             frame_limit = max(frame_limit, test.screenshot_frame + 10)
 
         cmd = [str(self.emulator), str(rom_path)]
-        env = os.environ.copy()
-        env["DEBUG"] = "1"
-        env["HEADLESS"] = "1"
+        env = self._base_env.copy()
         env["FRAMES"] = str(frame_limit)
 
         # For visual tests, capture a screenshot at the specified frame
         if test.test_type == TestType.VISUAL:
-            screenshot_path = self.screenshots_dir / f"{test.name}.png"
-            env["SAVE_SCREENSHOT"] = str(screenshot_path)
-            test.screenshot_path = screenshot_path
+            env["SAVE_SCREENSHOT"] = str(self.screenshots_dir / f"{test.name}.png")
 
         try:
             result = subprocess.run(
@@ -295,9 +377,12 @@ class GBATestRunner:
             test.output = str(e)
             return TestResult.FAIL
 
-        # For visual tests, check if screenshot was captured and mark accordingly
+        # For visual tests, check if screenshot was captured and mark accordingly.
+        # The emulator reports the saved path, so no filesystem probe is needed.
         if test.test_type == TestType.VISUAL:
-            if test.screenshot_path and test.screenshot_path.exists():
+            saved = _RE_SCREENSHOT_SAVED.search(test.output)
+            test.screenshot_path = Path(saved.group(1)) if saved else None
+            if test.screenshot_path:
                 test.result = TestResult.VISUAL
                 return TestResult.VISUAL
             elif test.exit_code == 0:
@@ -319,7 +404,7 @@ class GBATestRunner:
 
         # Check for [GBA] FAILED with test number (R12 > 0 in infinite loop)
         # Pattern: "[GBA] FAILED - Failed at test #N"
-        fail_match = re.search(r"\[GBA\] FAILED.*?test\s*#?(\d+)", test.output)
+        fail_match = _RE_GBA_FAILED_AT.search(test.output)
         if fail_match:
             test.failed_test_number = int(fail_match.group(1))
             if test.expected == "known_fail":
@@ -335,7 +420,7 @@ class GBATestRunner:
             return TestResult.PASS
 
         # Check for explicit failure with test number (legacy format)
-        fail_match = re.search(r"failed test\s*#?(\d+)", output_lower)
+        fail_match = _RE_FAILED_TEST.search(output_lower)
         if fail_match:
             test.failed_test_number = int(fail_match.group(1))
             if test.expected == "known_fail":
@@ -369,97 +454,68 @@ class GBATestRunner:
             print(f"\n{Colors.BLUE}=== {suite.name} ==={Colors.NC}")
             if self.verbose:
                 print(f"    {Colors.CYAN}{suite.description}{Colors.NC}")
+            sys.stdout.flush()
 
-        for test in suite.tests:
-            result = self.run_test(test)
+        # Per-test lines are collected and written once per suite. The pool
+        # yields results in suite order, so the listing matches a serial run.
+        lines: list[str] = []
+        results = (self._pool.map(self.run_test, suite.tests) if self._pool
+                   else map(self.run_test, suite.tests))
+        for test, result in zip(suite.tests, results):
 
             if self.verbose and not self.json_output:
-                symbol = {
-                    TestResult.PASS: f"{Colors.GREEN}PASS{Colors.NC}",
-                    TestResult.FAIL: f"{Colors.RED}FAIL{Colors.NC}",
-                    TestResult.KNOWN_FAIL: f"{Colors.YELLOW}KNOWN{Colors.NC}",
-                    TestResult.TIMEOUT: f"{Colors.YELLOW}TIMEOUT{Colors.NC}",
-                    TestResult.SKIP: f"{Colors.YELLOW}SKIP{Colors.NC}",
-                    TestResult.VISUAL: f"{Colors.CYAN}VISUAL{Colors.NC}",
-                }.get(result, "???")
-                print(f"  {symbol} {test.name}")
+                symbol = self._symbols.get(result, "???")
+                lines.append(f"  {symbol} {test.name}\n")
 
                 if result == TestResult.FAIL:
                     if test.failed_test_number is not None:
-                        print(f"       Failed at test #{test.failed_test_number}")
+                        lines.append(f"       Failed at test #{test.failed_test_number}\n")
                     if test.notes:
-                        print(f"       Note: {test.notes}")
+                        lines.append(f"       Note: {test.notes}\n")
                     # Show relevant debug output
                     for line in test.output.split('\n'):
                         if '[GBA]' in line:
-                            print(f"       {line.strip()}")
+                            lines.append(f"       {line.strip()}\n")
                 elif result == TestResult.VISUAL:
-                    if test.screenshot_path and test.screenshot_path.exists():
-                        print(f"       Screenshot: {test.screenshot_path}")
+                    if test.screenshot_path:
+                        lines.append(f"       Screenshot: {test.screenshot_path}\n")
                     if test.notes:
-                        print(f"       Note: {test.notes}")
+                        lines.append(f"       Note: {test.notes}\n")
 
+        suite.tally()
         if not self.json_output:
-            parts = [
-                f"{Colors.GREEN}Passed: {suite.passed}{Colors.NC}",
-                f"{Colors.RED}Failed: {suite.failed}{Colors.NC}",
-            ]
-            if suite.known_fails > 0:
-                parts.append(f"{Colors.YELLOW}Known: {suite.known_fails}{Colors.NC}")
-            if suite.visual > 0:
-                parts.append(f"{Colors.CYAN}Visual: {suite.visual}{Colors.NC}")
-            if suite.timeouts > 0:
-                parts.append(f"{Colors.YELLOW}Timeout: {suite.timeouts}{Colors.NC}")
-            if suite.skipped > 0:
-                parts.append(f"Skipped: {suite.skipped}")
-            print("  " + " | ".join(parts))
+            parts = []
+            for attr, tmpl, always in self._summary_fields:
+                n = getattr(suite, attr)
+                if always or n > 0:
+                    parts.append(tmpl.format(n))
+            lines.append("  " + " | ".join(parts) + "\n")
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
 
     def load_suites(self, categories: Optional[list[str]] = None):
         """Load test suites from configuration."""
         all_suites = self.config.get("test_suites", {})
 
-        # Category names map to the canonical "subsystem" key of each suite (v2),
-        # plus a few convenience aliases that map to specific suite ids.
-        subsystem_filters = {"cpu", "ppu", "timing", "memory", "mapper", "apu", "misc"}
-        alias_map = {
-            "arm": ["cpu_arm", "cpu_alyosha_core"],
-            "thumb": ["cpu_thumb", "cpu_alyosha_core"],
-            "fuzz": ["cpu_fuzz"],
-            "psr": ["cpu_psr"],
-            "ldm": ["cpu_ldm"],
-            "prefetch": ["prefetch"],
-            "irq": ["timing_irq", "timing_irq_nba"],
-            "dma": ["timing_dma", "timing_dma_nba"],
-            "fifo": ["timing_fifo_dma"],
-            "timer": ["timing_timer", "timing_timer_nba"],
-            "haltcnt": ["timing_haltcnt"],
-            "interactions": ["timing_interactions"],
-            "bus": ["memory_bus"],
-            "bios": ["bios", "bios_alyosha"],
-            "save": ["save"],
-            "unsafe": ["memory_unsafe"],
-            "ppu": ["ppu"],  # also handled by subsystem filter below
-        }
-
         # Determine which suites to load
         if categories:
+            by_subsystem: dict[str, list[str]] = {}
+            for sid, sc in all_suites.items():
+                by_subsystem.setdefault(sc.get("subsystem", ""), []).append(sid)
             suite_names = set()
             for cat in categories:
                 if cat in all_suites:
                     suite_names.add(cat)
-                elif cat in subsystem_filters:
-                    suite_names.update(
-                        sid for sid, sc in all_suites.items()
-                        if sc.get("subsystem", "") == cat
-                    )
-                elif cat in alias_map:
-                    suite_names.update(s for s in alias_map[cat] if s in all_suites)
+                elif cat in _SUBSYSTEM_FILTERS:
+                    suite_names.update(by_subsystem.get(cat, ()))
+                elif cat in _CATEGORY_ALIASES:
+                    suite_names.update(s for s in _CATEGORY_ALIASES[cat] if s in all_suites)
         else:
             suite_names = set(all_suites.keys())
 
         # Load suites from config
         for suite_name in sorted(suite_names):
-            suite_config = self.config.get("test_suites", {}).get(suite_name)
+            suite_config = all_suites.get(suite_name)
             if not suite_config:
                 continue
 
@@ -477,9 +533,10 @@ class GBATestRunner:
                 test_type_str = test_config.get("test_type", "automated")
                 test_type = TestType.VISUAL if test_type_str == "visual" else TestType.AUTOMATED
 
+                path = Path(test_config["path"])
                 test = TestCase(
-                    name=Path(test_config["path"]).stem,
-                    path=Path(test_config["path"]),
+                    name=path.stem,
+                    path=path,
                     expected=test_config.get("expected", "pass"),
                     repository=suite_repo,
                     test_type=test_type,
@@ -498,34 +555,50 @@ class GBATestRunner:
             self.load_suites(categories)
 
             if not self.json_output:
-                print(f"{Colors.BLUE}{'=' * 56}{Colors.NC}")
-                print(f"{Colors.BLUE}           GBA EMULATOR TEST SUITE{Colors.NC}")
-                print(f"{Colors.BLUE}{'=' * 56}{Colors.NC}")
-                print(f"\nEmulator:    {self.emulator}")
-                print(f"Timeout:     {self.TIMEOUT_SECONDS}s per test")
-                print(f"Frame limit: {self.config.get('frame_limit', 300)} frames")
-                print(f"Debug mode:  Enabled (DEBUG=1, HEADLESS=1)")
+                rule = f"{Colors.BLUE}{'=' * 56}{Colors.NC}"
+                lines = [
+                    rule,
+                    f"{Colors.BLUE}           GBA EMULATOR TEST SUITE{Colors.NC}",
+                    rule,
+                    f"\nEmulator:    {self.emulator}",
+                    f"Timeout:     {self.TIMEOUT_SECONDS}s per test",
+                    f"Frame limit: {self.config.get('frame_limit', 300)} frames",
+                    "Debug mode:  Enabled (DEBUG=1, HEADLESS=1)",
+                ]
                 repositories = self.config.get("repositories", {})
                 if repositories:
-                    print(f"Repositories: {len(repositories)}")
-                    for name, cfg in repositories.items():
-                        print(f"  - {name}: {cfg.get('description', cfg.get('url', ''))}")
+                    lines.append(f"Repositories: {len(repositories)}")
+                    lines.extend(
+                        f"  - {name}: {cfg.get('description', cfg.get('url', ''))}"
+                        for name, cfg in repositories.items()
+                    )
+                lines.append("")
+                sys.stdout.write("\n".join(lines))
 
+            if self.jobs > 1:
+                self._pool = ThreadPoolExecutor(max_workers=self.jobs)
             for suite in self.suites:
                 self.run_suite(suite)
 
             return self._print_summary()
         finally:
+            if self._pool is not None:
+                self._pool.shutdown(cancel_futures=True)
+                self._pool = None
             self.cleanup()
 
     def _print_summary(self) -> int:
         """Print final summary and return exit code."""
-        total_passed = sum(s.passed for s in self.suites)
-        total_failed = sum(s.failed for s in self.suites)
-        total_known = sum(s.known_fails for s in self.suites)
-        total_skipped = sum(s.skipped for s in self.suites)
-        total_timeouts = sum(s.timeouts for s in self.suites)
-        total_visual = sum(s.visual for s in self.suites)
+        # One pass over the suites' per-result counts instead of one per total
+        totals: Counter = Counter()
+        for s in self.suites:
+            totals.update(s.counts())
+        total_passed = totals[TestResult.PASS]
+        total_failed = totals[TestResult.FAIL]
+        total_known = totals[TestResult.KNOWN_FAIL]
+        total_skipped = totals[TestResult.SKIP]
+        total_timeouts = totals[TestResult.TIMEOUT]
+        total_visual = totals[TestResult.VISUAL]
         total_run = total_passed + total_failed + total_known
 
         if self.json_output:
@@ -565,29 +638,37 @@ class GBATestRunner:
                     for s in self.suites
                 ],
             }
-            print(json.dumps(results, indent=2))
+            write_json(results)
         else:
-            print(f"\n{Colors.BLUE}{'=' * 56}{Colors.NC}")
-            print(f"{Colors.BLUE}                 FINAL RESULTS{Colors.NC}")
-            print(f"{Colors.BLUE}{'=' * 56}{Colors.NC}")
-            print()
-            print(f"  {Colors.GREEN}Passed:       {total_passed}{Colors.NC}")
-            print(f"  {Colors.RED}Failed:       {total_failed}{Colors.NC}")
-            print(f"  {Colors.YELLOW}Known Issues: {total_known}{Colors.NC}")
+            rule = f"{Colors.BLUE}{'=' * 56}{Colors.NC}"
+            lines = [
+                "",
+                rule,
+                f"{Colors.BLUE}                 FINAL RESULTS{Colors.NC}",
+                rule,
+                "",
+                f"  {Colors.GREEN}Passed:       {total_passed}{Colors.NC}",
+                f"  {Colors.RED}Failed:       {total_failed}{Colors.NC}",
+                f"  {Colors.YELLOW}Known Issues: {total_known}{Colors.NC}",
+            ]
             if total_visual > 0:
-                print(f"  {Colors.CYAN}Visual:       {total_visual}{Colors.NC}")
-                print(f"  Screenshots:  {self.screenshots_dir}")
-            print(f"  Timeouts:     {total_timeouts}")
-            print(f"  Skipped:      {total_skipped}")
+                lines.append(f"  {Colors.CYAN}Visual:       {total_visual}{Colors.NC}")
+                lines.append(f"  Screenshots:  {self.screenshots_dir}")
+            lines.append(f"  Timeouts:     {total_timeouts}")
+            lines.append(f"  Skipped:      {total_skipped}")
             if total_run > 0:
                 pass_rate = total_passed / total_run * 100
-                print(f"\n  Pass Rate: {pass_rate:.1f}%")
-            print()
+                lines.append(f"\n  Pass Rate: {pass_rate:.1f}%")
+            lines.append("\n")
+            sys.stdout.write("\n".join(lines))
+            sys.stdout.flush()
 
         return 1 if total_failed > 0 else 0
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="GBA Emulator Test Suite (uses Veloce directly with DEBUG=1)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -611,6 +692,7 @@ Examples:
   python test_runner.py arm thumb    # Run ARM and Thumb tests
   python test_runner.py --keep       # Keep test ROMs
   python test_runner.py --json       # JSON output for CI
+  python test_runner.py -j 8         # 8 tests at a time
 
 Test ROM Sources:
   - jsmolka/gba-tests: Basic CPU, memory, BIOS, and save type tests
@@ -638,6 +720,12 @@ Test ROM Sources:
         action="store_true",
         help="Output results as JSON (for CI)",
     )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Tests to run in parallel (default: CPU count; 1 = serial)",
+    )
     args = parser.parse_args()
 
     try:
@@ -645,6 +733,7 @@ Test ROM Sources:
             keep_roms=args.keep,
             verbose=args.verbose,
             json_output=args.json,
+            jobs=args.jobs,
         )
         sys.exit(runner.run(args.categories or None))
     except FileNotFoundError as e:
@@ -388,21 +388,17 @@ void Bus::check_test_output() {
     uint8_t sig3 = cpu_peek(0x6003);
 
     // Debug: show what's at $6000 (every time, until signature found)
-    static int check_count = 0;
-    if (check_count < 10 && !(sig1 == 0xDE && sig2 == 0xB0 && sig3 == 0x61)) {
+    if (m_test_check_count < 10 && !(sig1 == 0xDE && sig2 == 0xB0 && sig3 == 0x61)) {
         fprintf(stderr, "Test check #%d: $6000=%02X sig=%02X %02X %02X\n",
-                check_count++, cpu_peek(0x6000), sig1, sig2, sig3);
+                m_test_check_count++, cpu_peek(0x6000), sig1, sig2, sig3);
     }
 
     if (sig1 == 0xDE && sig2 == 0xB0 && sig3 == 0x61) {
         uint8_t status = cpu_peek(0x6000);
 
         // Status: 0x80 = running, 0x81 = needs reset, 0x00-0x7F = finished with result
-        static bool result_printed = false;
-        static uint8_t last_status = 0x80;
-        if (status < 0x80 && !result_printed) {
-            result_printed = true;
-            last_status = status;
+        if (status < 0x80 && !m_test_result_printed) {
+            m_test_result_printed = true;
             fprintf(stderr, "\n=== TEST ROM RESULT ===\n");
             fprintf(stderr, "Status code: %d (%s)\n", status,
                     status == 0 ? "PASSED" : "FAILED");
@@ -108,6 +108,8 @@ public:
 
     // Test ROM support - check and print test output from $6000+
     void check_test_output();
+    // Forget the previous ROM's result so the next one is reported too
+    void reset_test_output() { m_test_check_count = 0; m_test_result_printed = false; }
 
 private:
     // Components
@@ -139,6 +141,10 @@ private:
 
     // CPU cycle counter
     uint64_t m_cpu_cycles = 0;
+
+    // Test ROM result tracking (per ROM; cleared by reset_test_output)
+    int m_test_check_count = 0;
+    bool m_test_result_printed = false;
 };
 
 } // namespace nes
@@ -156,6 +156,9 @@ private:
     uint64_t m_total_cycles = 0;
     uint64_t m_frame_count = 0;
 
+    // Frames since the last test ROM output check (see run_frame_internal)
+    int m_test_check_interval = 0;
+
     // nestest golden-trace mode: when TRACE=1, emit one nestest.log-format line
     // per CPU instruction (see trace.hpp). nestest.nes is also entered in its
     // "automated" mode (PC forced to $C000) with the canonical 7-cycle reset
@@ -274,8 +277,10 @@ void NESPlugin::reset() {
     m_cpu->reset();
     m_ppu->reset();
     m_apu->reset();
+    m_bus->reset_test_output();
     m_total_cycles = 0;
     m_frame_count = 0;
+    m_test_check_interval = 0;
     m_audio_samples = 0;
 }
 
@@ -356,9 +361,8 @@ void NESPlugin::run_frame_internal(uint32_t player1_buttons, uint32_t player2_bu
         if (m_ppu->check_frame_complete()) {
             frame_complete = true;
             // Check for test ROM output once per frame
-            static int check_interval = 0;
-            if (++check_interval >= 30) {
-                check_interval = 0;
+            if (++m_test_check_interval >= 30) {
+                m_test_check_interval = 0;
                 m_bus->check_test_output();
             }
         }
@@ -18,24 +18,65 @@ from __future__ import annotations
 
 import subprocess
 import sys
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
 # Make the shared testkit importable: cores/nes/tests -> repo root / tests
 sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "tests"))
 
 from veloce_testkit.runner import run_console_main  # noqa: E402
+from veloce_testkit.schema import load_config  # noqa: E402
 
 NES_TEST_ROMS_REPO = "https://github.com/christopherpow/nes-test-roms.git"
 
 
+def _config_top_dirs(script_dir: Path) -> list[str]:
+    """Top-level nes-test-roms directories referenced by test_config.json."""
+    cfg = load_config(script_dir / "test_config.json", "nes")
+    dirs: set[str] = set()
+    for suite in cfg.suites:
+        for t in suite.tests:
+            for rel in (t.file, t.trace_log):
+                parts = PurePosixPath(rel).parts if rel else ()
+                if len(parts) > 1:
+                    dirs.add(parts[0])
+    return sorted(dirs)
+
+
+def _sparse_clone(roms_dir: Path, dirs: list[str], verbose: bool) -> None:
+    """Blobless, sparse clone: only the configured suites' ROMs are downloaded."""
+    def run(*cmd: str) -> None:
+        subprocess.run(["git", *cmd], check=True, capture_output=not verbose)
+
+    run("clone", "--filter=blob:none", "--no-checkout", "--depth", "1",
+        NES_TEST_ROMS_REPO, str(roms_dir))
+    run("-C", str(roms_dir), "sparse-checkout", "init", "--cone")
+    run("-C", str(roms_dir), "sparse-checkout", "set", *dirs)
+    run("-C", str(roms_dir), "checkout")
+
+
 def nes_rom_provider(script_dir: Path, keep: bool, verbose: bool) -> Path:
     """Ensure nes-test-roms is present; return the dir test 'file' paths resolve against."""
     roms_dir = script_dir / "nes-test-roms"
     if not roms_dir.exists():
         if verbose:
             print(f"Cloning {NES_TEST_ROMS_REPO} ...")
+        try:
+            _sparse_clone(roms_dir, _config_top_dirs(script_dir), verbose)
+        except subprocess.CalledProcessError:
+            # Server or git too old for partial clone: fall back to a full one.
+            import shutil
+
+            shutil.rmtree(roms_dir, ignore_errors=True)
+            subprocess.run(
+                ["git", "clone", "--depth", "1", NES_TEST_ROMS_REPO, str(roms_dir)],
+                check=True,
+                capture_output=not verbose,
+            )
+    elif (roms_dir / ".git" / "info" / "sparse-checkout").exists():
+        # Suites added to the config since the first clone: widen the checkout.
         subprocess.run(
-            ["git", "clone", "--depth", "1", NES_TEST_ROMS_REPO, str(roms_dir)],
+            ["git", "-C", str(roms_dir), "sparse-checkout", "set",
+             *_config_top_dirs(script_dir)],
             check=True,
             capture_output=not verbose,
         )
@@ -33,6 +33,7 @@ import json
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Make the shared testkit importable: cores/snes/tests -> repo_root/tests.
@@ -40,15 +41,17 @@ _REPO_ROOT = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(_REPO_ROOT / "tests"))
 
 from veloce_testkit.runner import run_console_main  # noqa: E402
+from veloce_testkit.schema import load_config  # noqa: E402
 
 CONSOLE = "snes"
 ROM_EXTS = (".sfc", ".smc", ".bin")
+INDEX_NAME = ".rom_index.json"
 
 
 def _load_doc(script_dir: Path) -> dict:
+    # Shares the runner's memoized parse instead of re-reading the JSON.
     try:
-        with open(script_dir / "test_config.json") as f:
-            return json.load(f)
+        return load_config(script_dir / "test_config.json", CONSOLE).raw
     except Exception:
         return {}
 
@@ -84,6 +87,73 @@ def _clone(url: str, dest: Path, verbose: bool) -> bool:
         return False
 
 
+def _walk_roms(top: str, index: dict[str, str], seen: set[tuple[int, int]]) -> None:
+    # Same visiting order as os.walk(followlinks=True), so the first ROM with a
+    # given basename wins exactly as before; scandir avoids a stat per entry.
+    # Like os.walk, unreadable directories and broken entries are skipped.
+    # `seen` holds the (st_dev, st_ino) of every directory entered, so a
+    # symlink back up the tree cannot recurse forever.
+    try:
+        st = os.stat(top)
+    except OSError:
+        return
+    if (st.st_dev, st.st_ino) in seen:
+        return
+    seen.add((st.st_dev, st.st_ino))
+    subdirs = []
+    try:
+        with os.scandir(top) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(entry.path)
+                    # is_file() follows links: a dangling healed link is not a ROM.
+                    elif entry.name.lower().endswith(ROM_EXTS) and entry.is_file():
+                        index.setdefault(entry.name.lower(), entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    for sub in subdirs:
+        _walk_roms(sub, index, seen)
+
+
+def _rom_index(roms_dir: Path, needed: set[str]) -> dict[str, Path]:
+    """Basename -> ROM path for everything under roms_dir.
+
+    The walk is cached in roms/.rom_index.json, keyed by the mtimes of the
+    top-level entries (one per cloned repo), so it is redone after a new clone
+    or a change directly inside a repo root. ROMs added or moved deeper inside
+    a repo (a `git pull`, a dropped-in file) leave those mtimes alone, so a
+    cached index is only trusted if it maps every basename in `needed` (the
+    config ROMs not yet in place) to a file that still exists.
+    """
+    cache = roms_dir / INDEX_NAME
+    with os.scandir(roms_dir) as it:
+        stamp = {e.name: e.stat(follow_symlinks=False).st_mtime_ns
+                 for e in it if e.name != INDEX_NAME}
+    try:
+        doc = json.loads(cache.read_text())
+        if doc["stamp"] == stamp:
+            index = {k: roms_dir / v for k, v in doc["roms"].items()}
+            if all(k in index and index[k].exists() for k in needed):
+                return index
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    found: dict[str, str] = {}
+    _walk_roms(str(roms_dir), found, set())
+    index = {k: Path(v) for k, v in found.items()}
+    try:
+        cache.write_text(json.dumps({
+            "stamp": stamp,
+            "roms": {k: os.path.relpath(v, roms_dir) for k, v in found.items()},
+        }))
+    except OSError:
+        pass
+    return index
+
+
 def rom_provider(script_dir: Path, keep: bool, verbose: bool) -> Path:
     """Clone the configured repos under tests/roms/ and heal config paths.
 
@@ -95,42 +165,44 @@ def rom_provider(script_dir: Path, keep: bool, verbose: bool) -> Path:
     doc = _load_doc(script_dir)
     repos = doc.get("repositories", {})
     allow_net = os.environ.get("SNES_TEST_OFFLINE") != "1"
+    clones = []
     for rid, spec in repos.items():
         url = spec.get("url")
         sub = spec.get("dir", rid)
         if not url:
             continue
         if allow_net:
-            _clone(url, roms_dir / sub, verbose)
+            clones.append((url, roms_dir / sub))
         elif verbose:
             print(f"  (offline) skipping clone of {url}")
-
-    # Build a basename index across everything we cloned. Use os.walk with
-    # followlinks=True so a pre-existing clone symlinked under roms/ is indexed
-    # too (Path.rglob does not descend into symlinked directories).
-    index: dict[str, Path] = {}
-    for dirpath, _dirs, files in os.walk(roms_dir, followlinks=True):
-        for fn in files:
-            ext = os.path.splitext(fn)[1].lower()
-            if ext in ROM_EXTS:
-                index.setdefault(fn.lower(), Path(dirpath) / fn)
+    # Independent, network-bound clones: run them concurrently. Draining the
+    # results re-raises anything _clone did not handle, as a serial loop would.
+    if clones:
+        with ThreadPoolExecutor(max_workers=len(clones)) as pool:
+            urls, dests = zip(*clones)
+            list(pool.map(_clone, urls, dests, [verbose] * len(clones)))
+
+    # Build a basename index across everything we cloned. Symlinked
+    # directories are followed so a pre-existing clone symlinked under roms/ is
+    # indexed too (Path.rglob does not descend into symlinked directories).
+    absent = [rel for rel in _config_file_paths(doc) if not (roms_dir / rel).exists()]
+    index = _rom_index(roms_dir, {Path(rel).name.lower() for rel in absent})
 
     # Heal: for every config path, if the exact path is missing but a ROM with
     # the same basename exists, symlink it into place so the harness finds it.
     healed = 0
     missing = []
-    for rel in _config_file_paths(doc):
+    for rel in absent:
         target = roms_dir / rel
-        if target.exists():
-            continue
         src = index.get(Path(rel).name.lower())
         if src is not None:
             target.parent.mkdir(parents=True, exist_ok=True)
+            if target.is_symlink():
+                # Dangling link from an earlier heal whose ROM has since moved.
+                target.unlink()
             try:
                 target.symlink_to(src.resolve())
                 healed += 1
-            except FileExistsError:
-                pass
             except OSError:
                 import shutil
 
@@ -13,9 +13,11 @@
 #include "emu/emulator_plugin.hpp"
 
 #include <SDL.h>
+#include <nlohmann/json.hpp>
 #include <iostream>
 #include <fstream>
 #include <cstring>
+#include <cstdio>
 #include <sstream>
 #include <filesystem>
 
@@ -45,6 +47,10 @@ void Application::print_usage(const char* program_name) {
     std::cout << "  -h, --help       Show this help message and exit\n";
     std::cout << "  -v, --version    Show version information and exit\n";
     std::cout << "  -d, --debug      Enable debug mode (show CPU/PPU state)\n";
+    std::cout << "  --test-server    Headless test worker: read one JSON request per line\n";
+    std::cout << "                   from stdin ({\"rom\", \"frames\", \"save_screenshot\",\n";
+    std::cout << "                   \"emit_framebuffer_crc\"}), answer with VELOCE_TEST_DONE\n";
+    std::cout << "  --capabilities   List optional features of this build and exit\n";
     std::cout << "\n";
     std::cout << "Environment Variables:\n";
     std::cout << "  DEBUG=1          Enable debug output\n";
@@ -52,6 +58,9 @@ void Application::print_usage(const char* program_name) {
     std::cout << "  FRAMES=N         Run for N frames then exit (requires HEADLESS=1)\n";
     std::cout << "  SAVE_SCREENSHOT=N      Save screenshot at frame N\n";
     std::cout << "  SAVE_SCREENSHOT=path   Save screenshot at exit to specified path\n";
+    std::cout << "  EMIT_FRAMEBUFFER_CRC=1 Print FRAMEBUFFER_CRC32=<hex> to stderr at the\n";
+    std::cout << "                         screenshot frame (or at exit); no PNG is written\n";
+    std::cout << "                         unless SAVE_SCREENSHOT is also set\n";
     std::cout << "\n";
     std::cout << "ROM_FILE:\n";
     std::cout << "  Optional path to a ROM file to load on startup.\n";
@@ -70,6 +79,12 @@ void Application::print_version() {
     std::cout << "Supported systems: NES\n";
 }
 
+void Application::print_capabilities() {
+    // One feature per line; test harnesses probe this before relying on them
+    std::cout << "framebuffer-crc\n";
+    std::cout << "test-server\n";
+}
+
 bool Application::parse_command_line(int argc, char* argv[], std::string& rom_path) {
     rom_path.clear();
 
@@ -84,6 +99,13 @@ bool Application::parse_command_line(int argc, char* argv[], std::string& rom_pa
             print_version();
             return false;  // Signal to exit
         }
+        else if (std::strcmp(arg, "--capabilities") == 0) {
+            print_capabilities();
+            return false;  // Signal to exit
+        }
+        else if (std::strcmp(arg, "--test-server") == 0) {
+            m_test_server = true;
+        }
         else if (std::strcmp(arg, "-d") == 0 || std::strcmp(arg, "--debug") == 0) {
             m_debug_mode = true;
             std::cout << "Debug mode enabled\n";
@@ -112,7 +134,7 @@ bool Application::initialize(int argc, char* argv[]) {
 
     // Check for HEADLESS environment variable
     const char* headless_env = std::getenv("HEADLESS");
-    if (headless_env && headless_env[0] != '0') {
+    if ((headless_env && headless_env[0] != '0') || m_test_server) {
         m_headless_mode = true;
     }
 
@@ -128,20 +150,19 @@ bool Application::initialize(int argc, char* argv[]) {
     // Check for SAVE_SCREENSHOT environment variable (frame number or path)
     const char* screenshot_env = std::getenv("SAVE_SCREENSHOT");
     if (screenshot_env) {
-        // Check if it's a number (frame to screenshot) or a path
-        int frame_num = std::atoi(screenshot_env);
-        if (frame_num > 0) {
-            m_screenshot_at_frame = frame_num;
-        } else if (screenshot_env[0] != '\0') {
-            // Treat as output path, screenshot at last frame
-            m_screenshot_output_path = screenshot_env;
-            m_screenshot_at_frame = -2;  // -2 means screenshot at exit
-        }
+        set_screenshot_target(screenshot_env);
+    }
+
+    // Check for EMIT_FRAMEBUFFER_CRC environment variable (headless test runs
+    // verify the captured frame by hash instead of re-reading a PNG)
+    const char* crc_env = std::getenv("EMIT_FRAMEBUFFER_CRC");
+    if (crc_env && crc_env[0] != '\0' && crc_env[0] != '0') {
+        m_emit_framebuffer_crc = true;
     }
 
     // Headless mode validation
     if (m_headless_mode) {
-        if (rom_path.empty()) {
+        if (rom_path.empty() && !m_test_server) {
             std::cerr << "Error: HEADLESS=1 requires a ROM file\n";
             return false;
         }
@@ -258,6 +279,11 @@ bool Application::initialize(int argc, char* argv[]) {
 }
 
 void Application::run() {
+    if (m_test_server) {
+        run_test_server();
+        return;
+    }
+
     // Headless mode - run without GUI for automated testing
     if (m_headless_mode) {
         auto* active_plugin = m_plugin_manager->get_active_plugin();
@@ -290,36 +316,7 @@ void Application::run() {
             std::cerr << "Headless mode: Loaded " << input_schedule.size() << " input events\n";
         }
 
-        emu::InputState current_input{};
-        int frames_run = 0;
-
-        while (m_running && !m_quit_requested && frames_run < m_headless_frames) {
-            // Check for scheduled input
-            auto it = input_schedule.find(frames_run);
-            if (it != input_schedule.end()) {
-                current_input.buttons = it->second;
-            }
-
-            active_plugin->run_frame(current_input);
-            frames_run++;
-
-            // Check for screenshot at specific frame
-            if (m_screenshot_at_frame > 0 && frames_run == m_screenshot_at_frame) {
-                std::string path = m_screenshot_output_path.empty()
-                    ? ("screenshot_frame_" + std::to_string(frames_run) + ".png")
-                    : m_screenshot_output_path;
-                save_screenshot(path);
-            }
-        }
-
-        // Screenshot at exit (-2) or last frame
-        if (m_screenshot_at_frame == -2 || m_screenshot_requested) {
-            std::string path = m_screenshot_output_path.empty()
-                ? ("screenshot_final.png")
-                : m_screenshot_output_path;
-            save_screenshot(path);
-        }
-
+        int frames_run = run_headless_frames(input_schedule);
         std::cerr << "Headless mode: Ran " << frames_run << " frames\n";
         return;
     }
@@ -405,6 +402,101 @@ void Application::run() {
     }
 }
 
+int Application::run_headless_frames(const std::unordered_map<int, uint32_t>& input_schedule) {
+    auto* active_plugin = m_plugin_manager->get_active_plugin();
+    emu::InputState current_input{};
+    int frames_run = 0;
+
+    while (m_running && !m_quit_requested && frames_run < m_headless_frames) {
+        // Check for scheduled input
+        auto it = input_schedule.find(frames_run);
+        if (it != input_schedule.end()) {
+            current_input.buttons = it->second;
+        }
+
+        active_plugin->run_frame(current_input);
+        frames_run++;
+
+        // Check for screenshot at specific frame
+        if (m_screenshot_at_frame > 0 && frames_run == m_screenshot_at_frame) {
+            std::string path = m_screenshot_output_path.empty()
+                ? ("screenshot_frame_" + std::to_string(frames_run) + ".png")
+                : m_screenshot_output_path;
+            save_screenshot(path);
+            if (m_emit_framebuffer_crc) {
+                emit_framebuffer_crc();
+            }
+        }
+    }
+
+    // Screenshot at exit (-2) or last frame
+    bool capture_at_exit = m_screenshot_at_frame == -2 || m_screenshot_requested;
+    if (capture_at_exit) {
+        std::string path = m_screenshot_output_path.empty()
+            ? ("screenshot_final.png")
+            : m_screenshot_output_path;
+        save_screenshot(path);
+    }
+    // Without SAVE_SCREENSHOT the hash covers the final frame
+    if (m_emit_framebuffer_crc && (capture_at_exit || m_screenshot_at_frame == -1)) {
+        emit_framebuffer_crc();
+    }
+    return frames_run;
+}
+
+void Application::run_test_server() {
+    // Each request is one JSON line naming a ROM and the per-test settings that
+    // HEADLESS runs take from the environment. Everything the cores print for
+    // that test is followed by a single "VELOCE_TEST_DONE {...}" line on stdout,
+    // so a harness reading stdout (with stderr merged in) can split the stream
+    // per test and reuse the same detectors as one-process-per-test runs.
+    std::string line;
+    while (!m_quit_requested && std::getline(std::cin, line)) {
+        if (line.empty()) {
+            continue;
+        }
+
+        nlohmann::json reply = {{"loaded", false}, {"frames", 0}};
+        try {
+            nlohmann::json request = nlohmann::json::parse(line);
+            m_headless_frames = request.value("frames", 600);
+            if (m_headless_frames <= 0) {
+                m_headless_frames = 600;
+            }
+            m_screenshot_at_frame = -1;
+            m_screenshot_output_path.clear();
+            m_screenshot_requested = false;
+            set_screenshot_target(request.value("save_screenshot", std::string()).c_str());
+            m_emit_framebuffer_crc = request.value("emit_framebuffer_crc", false);
+
+            // Battery saves are flushed; per-ROM core state resets on load_rom
+            m_plugin_manager->unload_rom();
+            if (load_rom(request.at("rom").get<std::string>())) {
+                reply["loaded"] = true;
+                reply["frames"] = run_headless_frames({});
+            }
+        } catch (const nlohmann::json::exception& e) {
+            reply["error"] = e.what();
+        }
+
+        std::fflush(stdout);
+        std::cerr.flush();
+        std::cout << "VELOCE_TEST_DONE " << reply.dump() << std::endl;
+    }
+}
+
+void Application::set_screenshot_target(const char* value) {
+    // Check if it's a number (frame to screenshot) or a path
+    int frame_num = std::atoi(value);
+    if (frame_num > 0) {
+        m_screenshot_at_frame = frame_num;
+    } else if (value[0] != '\0') {
+        // Treat as output path, screenshot at last frame
+        m_screenshot_output_path = value;
+        m_screenshot_at_frame = -2;  // -2 means screenshot at exit
+    }
+}
+
 void Application::shutdown() {
     // Save input config before shutdown (not in headless mode)
     if (m_input_manager) {
@@ -1011,4 +1103,22 @@ bool Application::save_screenshot(const std::string& path) {
     return Screenshot::save_png(output_path, fb.pixels, fb.width, fb.height);
 }
 
+void Application::emit_framebuffer_crc() {
+    auto* plugin = m_plugin_manager ? m_plugin_manager->get_active_plugin() : nullptr;
+    if (!plugin || !plugin->is_rom_loaded()) {
+        return;
+    }
+
+    FrameBuffer fb = plugin->get_framebuffer();
+    if (!fb.pixels || fb.width <= 0 || fb.height <= 0) {
+        std::cerr << "[Screenshot] No framebuffer available\n";
+        return;
+    }
+
+    char line[32];
+    std::snprintf(line, sizeof(line), "FRAMEBUFFER_CRC32=%08x",
+                  Screenshot::framebuffer_crc32(fb.pixels, fb.width, fb.height));
+    std::cerr << line << std::endl;
+}
+
 } // namespace emu
@@ -5,6 +5,7 @@
 #include <memory>
 #include <vector>
 #include <cstdint>
+#include <unordered_map>
 
 namespace emu {
 
@@ -119,12 +120,24 @@ private:
     bool parse_command_line(int argc, char* argv[], std::string& rom_path);
     void print_usage(const char* program_name);
     void print_version();
+    void print_capabilities();
 
     void process_events();
     void update();
     void render();
     void run_emulation_frame();
 
+    // Headless testing: print the framebuffer CRC32 (EMIT_FRAMEBUFFER_CRC=1)
+    void emit_framebuffer_crc();
+
+    // Headless testing: run m_headless_frames frames of the loaded ROM, taking
+    // the configured screenshot / CRC. Returns the number of frames run.
+    int run_headless_frames(const std::unordered_map<int, uint32_t>& input_schedule);
+
+    // Headless testing: serve one test per stdin line (--test-server)
+    void run_test_server();
+    void set_screenshot_target(const char* value);  // SAVE_SCREENSHOT semantics
+
     // Get INetplayCapable interface from current emulator if available
     INetplayCapable* get_netplay_capable_emulator() const;
 
@@ -146,12 +159,14 @@ private:
     bool m_debug_mode = false;
     bool m_headless_mode = false;  // Run without GUI for testing
     int m_headless_frames = 0;     // Number of frames to run in headless mode (0 = unlimited)
+    bool m_test_server = false;    // Headless, ROMs and frame counts come from stdin
     float m_speed_multiplier = 1.0f;
 
     // Screenshot
     bool m_screenshot_requested = false;
     int m_screenshot_at_frame = -1;  // Frame number to auto-screenshot (-1 = disabled)
     std::string m_screenshot_output_path;  // Custom output path for screenshot
+    bool m_emit_framebuffer_crc = false;   // Print FRAMEBUFFER_CRC32=<hex> at capture time
 
     // Focus handling
     bool m_pause_on_focus_loss = true;  // Pause emulation when window loses focus
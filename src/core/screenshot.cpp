@@ -81,6 +81,61 @@ bool Screenshot::save_bmp(const std::filesystem::path& path,
     return result != 0;
 }
 
+namespace {
+
+// Slice-by-4 CRC32 tables (reflected polynomial 0xEDB88320, same as zlib).
+// One 32-bit pixel is folded per step, so hashing a frame costs a handful of
+// table lookups per pixel instead of a byte-at-a-time loop.
+struct Crc32Tables {
+    uint32_t t[4][256];
+
+    Crc32Tables() {
+        for (uint32_t i = 0; i < 256; i++) {
+            uint32_t c = i;
+            for (int k = 0; k < 8; k++) {
+                c = (c & 1) ? (0xEDB88320u ^ (c >> 1)) : (c >> 1);
+            }
+            t[0][i] = c;
+        }
+        for (uint32_t i = 0; i < 256; i++) {
+            for (int s = 1; s < 4; s++) {
+                t[s][i] = (t[s - 1][i] >> 8) ^ t[0][t[s - 1][i] & 0xFF];
+            }
+        }
+    }
+};
+
+const Crc32Tables& crc32_tables() {
+    static const Crc32Tables tables;
+    return tables;
+}
+
+} // namespace
+
+uint32_t Screenshot::framebuffer_crc32(const uint32_t* pixels,
+                                       int width, int height) {
+    if (!pixels || width <= 0 || height <= 0) {
+        return 0;
+    }
+
+    const auto& t = crc32_tables().t;
+    uint32_t crc = 0xFFFFFFFF;
+    const int count = width * height;
+    for (int i = 0; i < count; i++) {
+        uint32_t pixel = pixels[i];
+        // Same ARGB -> RGBA byte order save_png() writes, packed little-endian
+        // so the first byte (R) lands in the low bits.
+        uint32_t rgba = ((pixel >> 16) & 0xFF)
+                      | (pixel & 0xFF00)
+                      | ((pixel & 0xFF) << 16)
+                      | (pixel & 0xFF000000);
+        crc ^= rgba;
+        crc = t[3][crc & 0xFF] ^ t[2][(crc >> 8) & 0xFF]
+            ^ t[1][(crc >> 16) & 0xFF] ^ t[0][crc >> 24];
+    }
+    return crc ^ 0xFFFFFFFF;
+}
+
 std::string Screenshot::generate_filename(const std::string& prefix) {
     auto now = std::chrono::system_clock::now();
     auto time_t = std::chrono::system_clock::to_time_t(now);
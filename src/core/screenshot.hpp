@@ -20,6 +20,12 @@ public:
                          const uint32_t* pixels,
                          int width, int height);
 
+    // CRC32 (zlib polynomial) of the framebuffer as RGBA bytes, i.e. the same
+    // byte stream save_png() encodes. Lets headless test runs verify a frame
+    // without encoding a PNG or touching the disk.
+    static uint32_t framebuffer_crc32(const uint32_t* pixels,
+                                      int width, int height);
+
     // Generate a timestamped filename for screenshots
     static std::string generate_filename(const std::string& prefix = "screenshot");
 };
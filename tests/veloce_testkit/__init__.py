@@ -33,6 +33,8 @@ from .detect import (
     detect_cpu_trace,
 )
 from .harness import Harness, RunSettings, RunOutput
+from .history import TestHistory
+from .result_cache import ResultCache
 from .scoring import (
     SUBSYSTEM_WEIGHTS,
     ACCURACY_WEIGHTS,
@@ -49,7 +51,8 @@ __all__ = [
     "TestStatus", "DetectionResult",
     "detect_blargg_memory", "detect_serial_output", "detect_gba_register",
     "detect_screenshot_crc", "detect_cpu_trace",
-    "Harness", "RunSettings", "RunOutput",
+    "Harness", "RunSettings", "RunOutput", "TestHistory",
+    "ResultCache",
     "SUBSYSTEM_WEIGHTS", "ACCURACY_WEIGHTS", "PRIORITY_WEIGHTS",
     "score_test", "score_suite", "score_console", "Scorecard",
 ]
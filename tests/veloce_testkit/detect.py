@@ -43,13 +43,15 @@ detect_gba_register() parses those. Treated as the serial family for config.
 ===========================================================================
 4. SCREENSHOT CRC  (all; method = "screenshot-crc", accuracy_type "visual")
 ===========================================================================
-The binary is run with SAVE_SCREENSHOT=<frame> (or =<path>), producing a PNG of
-the framebuffer at that frame. We CRC32 the PNG bytes and compare to the test's
+The binary is run with EMIT_FRAMEBUFFER_CRC=1 and, at the capture frame, prints
+    "FRAMEBUFFER_CRC32=<8 hex digits>"
+to stderr: the CRC32 of the framebuffer as RGBA bytes, computed in-process so no
+PNG is encoded, written, or re-read on the pass path. We compare it to the test's
 "reference_hash". Equal => PASS, differ => FAIL. With --generate-refs the
 measured hash is emitted for the console agent to paste into test_config.json.
 NOTE: CRC is exact-match; any 1-pixel diff fails. That is intentional for
 pixel-accurate tests (dmg-acid2, mealybug). Reference hashes are tied to a fixed
-output resolution and PNG encoder, so regenerate them if either changes.
+output resolution, so regenerate them if it changes.
 
 ===========================================================================
 5. CPU GOLDEN TRACE  (NES nestest; method = "cpu-trace", "cycle-accurate")
@@ -65,12 +67,59 @@ Partial credit (fraction of matching lines) is reported for scoring nuance.
 from __future__ import annotations
 
 import re
-import zlib
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Optional
 
+# Compiled once: every test's full output goes through these.
+_RE_BLARGG_STATUS = re.compile(r"BLARGG_STATUS:\s*0x([0-9A-Fa-f]+)")
+_RE_BLARGG_RESULT = re.compile(r"BLARGG_RESULT:\s*(.+)")
+_RE_STATUS_CODE = re.compile(r"Status code:\s*(\d+)\s*\((PASSED|FAILED)\)", re.I)
+_RE_PASSED_WORD = re.compile(r"\bpassed\b", re.I)
+_RE_FAILED_WORD = re.compile(r"\bfailed\b", re.I)
+_RE_GBA_FAILED_AT = re.compile(r"\[GBA\]\s*FAILED.*?test\s*#?(\d+)")
+_RE_FRAMEBUFFER_CRC = re.compile(r"FRAMEBUFFER_CRC32=([0-9A-Fa-f]{8})")
+
+# Lines a core prints to stderr (so unbuffered) once the test ROM has reached
+# its final result: NES and GBA print theirs once, SNES repeats its report every
+# frame from then on. Nothing printed after the first one can change the
+# verdict, so the harness may stop the run there instead of finishing FRAMES.
+# Bytes patterns, matched against the raw pipe stream, so each one requires the
+# line's newline: a partial read never counts. GB serial tests have none: their
+# "=== TEST PASSED ===" goes to block-buffered stdout, and no core prints the
+# MOONEYE line yet, so they always run out FRAMES.
+FINAL_VERDICT_MEMORY = re.compile(
+    rb"(?:Status code:\s*\d+\s*\((?:PASSED|FAILED)\)"
+    rb"|BLARGG_STATUS:\s*0x(?!8[01]\b)[0-9A-Fa-f]+)[^\n]*\n",
+    re.I,
+)
+FINAL_VERDICT_GBA = re.compile(rb"\[GBA\]\s*(?:PASSED|FAILED)[^\n]*\n")
+
+# Verdict lines are printed once, when a test finishes: near the end of what can
+# be megabytes of DEBUG=1 output. Patterns are tried on this many trailing
+# characters first and only on the whole output when the tail has no match, so
+# a verdict printed once is found either way. "Status code" lines are the
+# exception: any "0 (PASSED)" wins over FAILED ones, so they are always read in
+# full.
+_TAIL_CHARS = 64 * 1024
+
+
+def _search(pattern: re.Pattern, output: str) -> Optional[re.Match]:
+    if len(output) > _TAIL_CHARS:
+        m = pattern.search(output, len(output) - _TAIL_CHARS)
+        if m:
+            return m
+    return pattern.search(output)
+
+
+def _findall(pattern: re.Pattern, output: str) -> list:
+    if len(output) > _TAIL_CHARS:
+        found = pattern.findall(output, len(output) - _TAIL_CHARS)
+        if found:
+            return found
+    return pattern.findall(output)
+
 
 class TestStatus(str, Enum):
     PASS = "pass"
@@ -96,7 +145,7 @@ class DetectionResult:
 # 1. Blargg memory protocol
 # --------------------------------------------------------------------------
 def detect_blargg_memory(output: str, exit_code: int) -> DetectionResult:
-    m = re.search(r"BLARGG_STATUS:\s*0x([0-9A-Fa-f]+)", output)
+    m = _search(_RE_BLARGG_STATUS, output)
     if m:
         status = int(m.group(1), 16)
         if status == 0x00:
@@ -107,19 +156,26 @@ def detect_blargg_memory(output: str, exit_code: int) -> DetectionResult:
         return DetectionResult(TestStatus.FAIL, f"failed code {status}", status, 0.0)
 
     txt = ""
-    mt = re.search(r"BLARGG_RESULT:\s*(.+)", output)
+    mt = _search(_RE_BLARGG_RESULT, output)
     if mt:
         txt = mt.group(1).strip()
 
-    if re.search(r"Status code:\s*0\s*\(PASSED\)", output, re.I):
-        return DetectionResult(TestStatus.PASS, txt or "Passed", 0, 1.0)
-    mf = re.search(r"Status code:\s*(\d+)\s*\(FAILED\)", output, re.I)
-    if mf:
-        return DetectionResult(TestStatus.FAIL, txt, int(mf.group(1)), 0.0)
+    # One scan for both "Status code" forms; a "0 (PASSED)" anywhere wins, so
+    # this one always reads the whole output (a FAILED tail must not hide it).
+    failed_code = None
+    for code, verdict in _RE_STATUS_CODE.findall(output):
+        if verdict.upper() == "PASSED":
+            if int(code) == 0:
+                return DetectionResult(TestStatus.PASS, txt or "Passed", 0, 1.0)
+        elif failed_code is None:
+            failed_code = int(code)
+    if failed_code is not None:
+        return DetectionResult(TestStatus.FAIL, txt, failed_code, 0.0)
 
-    if re.search(r"\bpassed\b", output, re.I) and not re.search(r"\bfailed\b", output, re.I):
+    failed = _search(_RE_FAILED_WORD, output) is not None
+    if not failed and _search(_RE_PASSED_WORD, output):
         return DetectionResult(TestStatus.PASS, txt or "Passed", 0, 1.0)
-    if re.search(r"\bfailed\b", output, re.I):
+    if failed:
         return DetectionResult(TestStatus.FAIL, txt or "Failed", 1, 0.0)
 
     if exit_code == 0:
@@ -140,7 +196,7 @@ def detect_serial_output(output: str, exit_code: int) -> DetectionResult:
         return DetectionResult(TestStatus.PASS, "serial: Passed", 0, 1.0)
     if "Failed" in output:
         return DetectionResult(TestStatus.FAIL, "serial: Failed", 1, 0.0)
-    if re.search(r"Status code:\s*0\s*\(PASSED\)", output, re.I):
+    if any(v.upper() == "PASSED" and int(c) == 0 for c, v in _RE_STATUS_CODE.findall(output)):
         return DetectionResult(TestStatus.PASS, "Passed", 0, 1.0)
     if exit_code == 0:
         return DetectionResult(TestStatus.RUNS, "no serial verdict", None, 0.0)
@@ -153,7 +209,7 @@ def detect_serial_output(output: str, exit_code: int) -> DetectionResult:
 def detect_gba_register(output: str, exit_code: int) -> DetectionResult:
     if "[GBA] PASSED" in output:
         return DetectionResult(TestStatus.PASS, "GBA passed", 0, 1.0)
-    mf = re.search(r"\[GBA\]\s*FAILED.*?test\s*#?(\d+)", output)
+    mf = _search(_RE_GBA_FAILED_AT, output)
     if mf:
         n = int(mf.group(1))
         return DetectionResult(TestStatus.FAIL, f"failed at test #{n}", n, 0.0)
@@ -167,22 +223,21 @@ def detect_gba_register(output: str, exit_code: int) -> DetectionResult:
 # --------------------------------------------------------------------------
 # 4. Screenshot CRC
 # --------------------------------------------------------------------------
-def crc32_file(path: Path) -> str:
-    if not Path(path).exists():
-        return ""
-    with open(path, "rb") as f:
-        return format(zlib.crc32(f.read()) & 0xFFFFFFFF, "08x")
+def framebuffer_crc(output: str) -> str:
+    """Last FRAMEBUFFER_CRC32 the binary printed, as lowercase hex ("" if none)."""
+    found = _findall(_RE_FRAMEBUFFER_CRC, output)
+    return found[-1].lower() if found else ""
 
 
 def detect_screenshot_crc(
-    screenshot_path: Path,
+    output: str,
     reference_hash: str,
     *,
     generate_refs: bool = False,
 ) -> DetectionResult:
-    actual = crc32_file(screenshot_path)
+    actual = framebuffer_crc(output)
     if not actual:
-        return DetectionResult(TestStatus.SKIP, "no screenshot captured", None, 0.0)
+        return DetectionResult(TestStatus.SKIP, "no framebuffer CRC emitted", None, 0.0)
     if generate_refs:
         # caller records actual into config; report as a non-scoring RUNS
         return DetectionResult(TestStatus.RUNS, f"hash={actual}", None, 0.0)
@@ -190,7 +245,7 @@ def detect_screenshot_crc(
         return DetectionResult(
             TestStatus.SKIP, f"no reference_hash (measured {actual})", None, 0.0
         )
-    if actual == reference_hash:
+    if actual == reference_hash.lower():
         return DetectionResult(TestStatus.PASS, f"hash={actual}", 0, 1.0)
     return DetectionResult(
         TestStatus.FAIL, f"hash mismatch exp {reference_hash} got {actual}", 1, 0.0
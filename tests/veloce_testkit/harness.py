@@ -8,7 +8,15 @@ Environment contract with the binary (unchanged from existing runners):
   DEBUG=1             emit BLARGG_STATUS / Status code / [GBA] lines, serial echo
   FRAMES=<n>          run n frames then exit
   SAVE_SCREENSHOT=<f> capture framebuffer at frame f (path or frame number)
+  EMIT_FRAMEBUFFER_CRC=1  print FRAMEBUFFER_CRC32=<hex> for the captured frame
   TRACE=1             (cpu-trace tests) emit nestest-format instruction trace
+  --test-server       (RunSettings.server) same settings per JSON request on
+                      stdin, one long-lived process per job; see worker.py
+
+Memory tests and GBA serial tests stop early: once a core prints its final
+verdict line (detect.FINAL_VERDICT_*), the process is given VERDICT_GRACE_S to
+finish the report and is then killed instead of running out FRAMES. Every
+run keeps at most the last OUTPUT_CAP bytes of output.
 
 Determinism note: tests are run with a fixed FRAMES budget and no wall-clock
 dependence in the verdict, so results are reproducible across machines as long
@@ -17,9 +25,15 @@ as the binary itself is deterministic (a TAS/netplay requirement anyway).
 
 from __future__ import annotations
 
+import functools
 import os
-import shutil
+import queue
+import re
+import select
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
@@ -33,10 +47,28 @@ from .detect import (
     detect_gba_register,
     detect_screenshot_crc,
     detect_cpu_trace,
+    FINAL_VERDICT_MEMORY,
+    FINAL_VERDICT_GBA,
 )
 from .scoring import score_test, TestPoint
+from .history import TestHistory
+from .result_cache import ResultCache
+from .worker import EmulatorWorker, supports_test_server
+
+# Verdicts that make a run fail CI (and stop it under fail_fast).
+HARD_FAIL = (TestStatus.FAIL, TestStatus.TIMEOUT, TestStatus.ERROR)
+
+# How long a run may keep going after its final verdict line, so the rest of
+# the core's report (result text, failing sub-test) still lands in the output.
+VERDICT_GRACE_S = 0.2
+
+# Output kept per run. Verdict lines come at the end (or stop the run), so a
+# ROM stuck in a print loop costs bounded memory and detector time; the
+# oldest output is dropped first.
+OUTPUT_CAP = 16 << 20
 
 
+@functools.lru_cache(maxsize=4)
 def find_emulator(project_root: Path) -> Path:
     for cand in (project_root / "build" / "bin" / "veloce",
                  project_root / "build" / "veloce"):
@@ -47,6 +79,77 @@ def find_emulator(project_root: Path) -> Path:
     )
 
 
+def run_until_verdict(
+    argv: list[str], cwd: Path, env: dict[str, str], timeout: float,
+    verdict: Optional[re.Pattern] = None,
+) -> tuple[str, int]:
+    """Run the binary once; returns (stdout+stderr, exit code).
+
+    The merged output is streamed and only its last OUTPUT_CAP bytes are kept.
+    With a `verdict` pattern (bytes) the process is killed VERDICT_GRACE_S
+    after the first match and then reports exit code 0. Raises
+    subprocess.TimeoutExpired like subprocess.run.
+    """
+    # Keep these launches free of preexec_fn / start_new_session / uid-gid
+    # changes: CPython >= 3.10 then starts the child with vfork() rather than
+    # fork(), so hundreds of launches never copy the runner's page tables.
+    # (posix_spawn is not an option: it cannot honor cwd, and the binary must
+    # run from project_root to find its plugins.)
+    if os.name != "posix":
+        proc = subprocess.run(
+            argv, capture_output=True, text=True, timeout=timeout, env=env, cwd=str(cwd),
+        )
+        return proc.stdout + proc.stderr, proc.returncode
+
+    proc = subprocess.Popen(
+        argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env, cwd=str(cwd),
+    )
+    fd = proc.stdout.fileno()
+    chunks: deque[bytes] = deque()
+    kept = dropped = 0
+    deadline = time.monotonic() + timeout
+    stop_at = None      # set once the verdict line has been seen
+    line = b""          # unfinished last line, searched again with the next read
+
+    def output() -> str:
+        text = b"".join(chunks).decode(errors="replace")
+        if dropped:
+            text = f"[... {dropped} bytes of earlier output dropped ...]\n" + text
+        return text
+
+    try:
+        while True:
+            now = time.monotonic()
+            if stop_at is not None and now >= min(stop_at, deadline):
+                proc.kill()
+                return output(), 0
+            if now >= deadline:
+                proc.kill()
+                raise subprocess.TimeoutExpired(argv, timeout)
+            ready, _, _ = select.select([fd], [], [], min(stop_at or deadline, deadline) - now)
+            if not ready:
+                continue
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                return output(), proc.wait()
+            chunks.append(chunk)
+            kept += len(chunk)
+            while kept - len(chunks[0]) >= OUTPUT_CAP:
+                n = len(chunks.popleft())
+                kept -= n
+                dropped += n
+            if verdict is not None and stop_at is None:
+                text = line + chunk
+                if verdict.search(text):
+                    stop_at = time.monotonic() + VERDICT_GRACE_S
+                line = text[text.rfind(b"\n") + 1:]
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        proc.stdout.close()
+
+
 @dataclass
 class RunSettings:
     project_root: Path
@@ -56,6 +159,28 @@ class RunSettings:
     default_frames: int = 1800
     default_timeout: int = 60
     generate_refs: bool = False
+    # screenshot-crc verdicts come from the CRC the binary prints; a PNG is only
+    # written (and kept for failing tests) when this debug switch is on.
+    save_screenshots: bool = False
+    # Optional run history: orders each suite fast/flaky-first and is updated
+    # with this run's timings. fail_fast stops at the first hard failure.
+    history: Optional[TestHistory] = None
+    fail_fast: bool = False
+    # Optional verdict cache: PASS/KNOWN_FAIL tests with unchanged ROM, build,
+    # config entry and run settings are not rerun (see result_cache.py).
+    result_cache: Optional[ResultCache] = None
+    # Concurrent emulator processes. Each test is an independent single-threaded
+    # subprocess with a frame-count (not wall-clock) budget, so verdicts do not
+    # depend on this; 1 runs strictly in order for debugging.
+    jobs: int = 1
+    # Reuse one `veloce --test-server` process per job instead of launching the
+    # binary per test (cpu-trace tests still get their own process). Ignored
+    # when the binary does not advertise the capability or the console is not
+    # in worker.SERVER_CONSOLES.
+    server: bool = False
+    # Stop memory and GBA serial tests at the core's final verdict line rather
+    # than after FRAMES; the verdict is the same either way.
+    stop_at_verdict: bool = True
     # GBA register protocol is selected when the config declares result_detection
     # "serial" AND console == "gba"; the harness keys off the console.
     console: str = ""
@@ -66,7 +191,7 @@ class RunSettings:
         self.screenshots_dir.mkdir(parents=True, exist_ok=True)
 
 
-@dataclass
+@dataclass(slots=True)
 class RunOutput:
     test: TestSpec
     status: TestStatus
@@ -75,6 +200,7 @@ class RunOutput:
     exit_code: int = 0
     actual_hash: str = ""          # for screenshot-crc generate-refs flow
     point: Optional[TestPoint] = None
+    cached: bool = False           # verdict came from the result cache
 
 
 class Harness:
@@ -82,24 +208,32 @@ class Harness:
         self.config = config
         self.s = settings
         self.s.console = self.s.console or config.console
+        self._workers: Optional[queue.Queue[EmulatorWorker]] = None
+        # Built once; each test copies it and adds its own FRAMES/TRACE/...
+        self._base_env = os.environ.copy()
+        self._base_env["HEADLESS"] = "1"
+        self._base_env["DEBUG"] = "1"
+        # Resolved once rather than walking the path's symlinks for every test
+        self._emulator = str(self.s.emulator.resolve())
 
     # -- single test ------------------------------------------------------
     def run_test(self, test: TestSpec, *, known_fail_override: bool = False) -> RunOutput:
-        rom = (self.s.roms_dir / test.file)
-        if not rom.exists():
+        # One realpath both checks the ROM exists and gives the launch path.
+        try:
+            rom = (self.s.roms_dir / test.file).resolve(strict=True)
+        except OSError:
             return self._finish(test, DetectionResult(TestStatus.SKIP, "ROM not found"))
 
-        env = os.environ.copy()
-        env["HEADLESS"] = "1"
-        env["DEBUG"] = "1"
+        env = self._base_env.copy()
 
         screenshot_path = None
         if test.result_detection == DetectionMethod.SCREENSHOT_CRC:
             frames = test.screenshot_frame + 10
             env["FRAMES"] = str(frames)
-            safe = str(test.file).replace("/", "_").replace(" ", "_")
-            screenshot_path = self.s.screenshots_dir / f"{safe}.png"
-            env["SAVE_SCREENSHOT"] = str(screenshot_path)
+            env["EMIT_FRAMEBUFFER_CRC"] = "1"
+            if self.s.save_screenshots:
+                screenshot_path = self.s.screenshots_dir / f"{test.safe_name}.png"
+                env["SAVE_SCREENSHOT"] = str(screenshot_path)
         trace_path = None
         if test.result_detection != DetectionMethod.SCREENSHOT_CRC:
             env["FRAMES"] = str(test.frames or self.config.frame_limit or self.s.default_frames)
@@ -109,30 +243,85 @@ class Harness:
                 # by TRACE_FILE. We read that file back for comparison, keeping
                 # the trace on a clean channel regardless of other stdout noise.
                 env["TRACE"] = "1"
-                safe = str(test.file).replace("/", "_").replace(" ", "_")
-                trace_path = self.s.screenshots_dir / f"{safe}.trace"
+                trace_path = self.s.screenshots_dir / f"{test.safe_name}.trace"
                 env["TRACE_FILE"] = str(trace_path)
 
         timeout = self.config.timeout_seconds or self.s.default_timeout
+        cache = self.s.result_cache
+        cache_key = ""
+        if cache is not None and not self.s.generate_refs:
+            run = (timeout, self.s.stop_at_verdict, self._workers is not None)
+            cache_key = cache.key(test, rom, self.s.roms_dir, int(env["FRAMES"]), run)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                out = self._finish(test, cached)
+                out.cached = True
+                return out
+
         try:
-            proc = subprocess.run(
-                [str(self.s.emulator.resolve()), str(rom.resolve())],
-                capture_output=True, text=True, timeout=timeout, env=env,
-                cwd=str(self.s.project_root),
-            )
-            output = proc.stdout + proc.stderr
-            exit_code = proc.returncode
+            if self._workers is not None and trace_path is None:
+                output, exit_code = self._run_on_worker(rom, env, timeout)
+            else:
+                verdict = self._verdict_line(test) if self.s.stop_at_verdict else None
+                output, exit_code = run_until_verdict(
+                    [self._emulator, str(rom)],
+                    self.s.project_root, env, timeout, verdict,
+                )
         except subprocess.TimeoutExpired:
             return self._finish(test, DetectionResult(TestStatus.TIMEOUT, f"timeout {timeout}s"))
         except Exception as e:  # noqa: BLE001
             return self._finish(test, DetectionResult(TestStatus.ERROR, str(e)))
 
-        det = self._detect(test, output, exit_code, screenshot_path, trace_path)
-        return self._finish(test, det, output=output, exit_code=exit_code)
+        det = self._detect(test, output, exit_code, trace_path)
+        if screenshot_path is not None and det.status == TestStatus.PASS:
+            # --save-screenshots keeps PNGs for inspecting failures only.
+            screenshot_path.unlink(missing_ok=True)
+        out = self._finish(test, det, output=output, exit_code=exit_code)
+        if cache_key and out.status in (TestStatus.PASS, TestStatus.KNOWN_FAIL):
+            cache.put(cache_key, det)
+        return out
+
+    def _verdict_line(self, test: TestSpec) -> Optional[re.Pattern]:
+        m = test.result_detection
+        if m == DetectionMethod.MEMORY:
+            return FINAL_VERDICT_MEMORY
+        if m == DetectionMethod.SERIAL:
+            # No core flushes a final serial line yet (see detect.py).
+            return FINAL_VERDICT_GBA if self.s.console == "gba" else None
+        return None  # screenshot-crc and cpu-trace need the whole run
+
+    def _run_on_worker(self, rom: Path, env: dict[str, str], timeout: int) -> tuple[str, int]:
+        request = {
+            "rom": str(rom),
+            "frames": int(env["FRAMES"]),
+            "save_screenshot": env.get("SAVE_SCREENSHOT", ""),
+            "emit_framebuffer_crc": "EMIT_FRAMEBUFFER_CRC" in env,
+        }
+        worker = self._workers.get()
+        try:
+            return worker.submit(request, timeout)
+        finally:
+            self._workers.put(worker)
+
+    def _start_workers(self) -> None:
+        emulator = Path(self._emulator)
+        if not supports_test_server(emulator, self.s.project_root, self.s.console):
+            return
+        self._workers = queue.Queue()
+        for _ in range(max(1, self.s.jobs)):
+            self._workers.put(EmulatorWorker(
+                [str(emulator), "--test-server"], self.s.project_root, self._base_env,
+                OUTPUT_CAP))
+
+    def _stop_workers(self) -> None:
+        if self._workers is not None:
+            while not self._workers.empty():
+                self._workers.get_nowait().close()
+            self._workers = None
 
     def _detect(
         self, test: TestSpec, output: str, exit_code: int,
-        screenshot_path: Optional[Path], trace_path: Optional[Path] = None,
+        trace_path: Optional[Path] = None,
     ) -> DetectionResult:
         m = test.result_detection
         if m == DetectionMethod.MEMORY:
@@ -143,7 +332,7 @@ class Harness:
             return detect_serial_output(output, exit_code)
         if m == DetectionMethod.SCREENSHOT_CRC:
             return detect_screenshot_crc(
-                screenshot_path, test.reference_hash, generate_refs=self.s.generate_refs
+                output, test.reference_hash, generate_refs=self.s.generate_refs
             )
         if m == DetectionMethod.CPU_TRACE:
             golden = self.s.roms_dir / test.trace_log
@@ -184,10 +373,54 @@ class Harness:
 
     # -- whole config -----------------------------------------------------
     def run_all(self, *, suite_filter: Optional[set[str]] = None) -> list[RunOutput]:
-        results: list[RunOutput] = []
+        history = self.s.history
+        plan: list[TestSpec] = []
         for suite in self.config.suites:
             if suite_filter and suite.id not in suite_filter and suite.subsystem not in suite_filter:
                 continue
-            for test in suite.tests:
-                results.append(self.run_test(test))
+            tests = suite.tests
+            if history is not None:
+                tests = sorted(tests, key=history.sort_key)
+            plan.extend(tests)
+
+        if self.s.server:
+            self._start_workers()
+        try:
+            if self.s.jobs <= 1:
+                timed = map(self._run_timed, plan)
+                return self._collect(timed)
+            # Threads are enough: each worker just blocks on its emulator process.
+            # Results are collected in plan order, so output and history are the
+            # same as a serial run.
+            # Without fail_fast, the pool is fed longest-expected-first (LPT) so
+            # the slowest ROMs do not start last and straggle; results are
+            # still collected in plan order.
+            submit_order = list(range(len(plan)))
+            if history is not None and not self.s.fail_fast:
+                submit_order.sort(key=lambda i: history.mean_ms(plan[i]), reverse=True)
+            pool = ThreadPoolExecutor(max_workers=self.s.jobs)
+            try:
+                futures: list = [None] * len(plan)
+                for i in submit_order:
+                    futures[i] = pool.submit(self._run_timed, plan[i])
+                return self._collect(f.result() for f in futures)
+            finally:
+                pool.shutdown(cancel_futures=True)
+        finally:
+            self._stop_workers()
+
+    def _run_timed(self, test: TestSpec) -> tuple[RunOutput, float]:
+        start = time.monotonic()
+        r = self.run_test(test)
+        return r, (time.monotonic() - start) * 1000.0
+
+    def _collect(self, timed) -> list[RunOutput]:
+        results: list[RunOutput] = []
+        history = self.s.history
+        for r, elapsed_ms in timed:
+            if history is not None and r.status != TestStatus.SKIP and not r.cached:
+                history.record(r.test.id, elapsed_ms, r.status in HARD_FAIL)
+            results.append(r)
+            if self.s.fail_fast and r.status in HARD_FAIL:
+                break
         return results
@@ -0,0 +1,73 @@
+"""
+Per-test run history, used to schedule work so failures surface early.
+
+After every run the harness records each test's wall time and whether it
+failed. On the next run, tests inside each suite are stable-sorted by
+(mean duration asc, fail rate desc): quick tests and recently-failing tests go
+first, so with --fail-fast (or just by watching the -v stream) a broken build is
+reported in seconds instead of after the slowest ROMs. Tests with no history
+sort as if they took DEFAULT_MEAN_MS. Suite order is left alone. With -j > 1
+(and no --fail-fast) the same means decide which tests start first: longest
+first, so no slow ROM is left to run alone at the end.
+
+The history is a local cache, never an input to a verdict or the score:
+    $XDG_CACHE_HOME/veloce/test_history.json   (default ~/.cache/veloce/...)
+    { "<console>": { "<test id>": {"runs": n, "mean_ms": x, "fail_rate": f} } }
+Runs of different consoles share the file; save() merges only the tests this
+run recorded into the file's current contents (see util.update_json).
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from .util import cache_dir, update_json
+
+DEFAULT_MEAN_MS = 10_000.0
+
+
+def default_history_path() -> Path:
+    return cache_dir() / "test_history.json"
+
+
+class TestHistory:
+    def __init__(self, console: str, path: Path | None = None):
+        self.console = console
+        self.path = Path(path) if path else default_history_path()
+        try:
+            self._doc = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._doc = {}
+        self._tests: dict[str, dict] = self._doc.setdefault(console, {})
+        self._recorded: set[str] = set()
+
+    def sort_key(self, test) -> tuple[float, float]:
+        """Key for sorted(): fastest first, then most failure-prone first."""
+        h = self._tests.get(test.id, {})
+        return (h.get("mean_ms", DEFAULT_MEAN_MS), -h.get("fail_rate", 0.0))
+
+    def mean_ms(self, test) -> float:
+        """Expected wall time; parallel runs start the longest tests first."""
+        return self._tests.get(test.id, {}).get("mean_ms", DEFAULT_MEAN_MS)
+
+    def record(self, test_id: str, elapsed_ms: float, failed: bool) -> None:
+        h = self._tests.setdefault(test_id, {"runs": 0, "mean_ms": 0.0, "fail_rate": 0.0})
+        n = h["runs"] + 1
+        h["mean_ms"] = round(h["mean_ms"] + (elapsed_ms - h["mean_ms"]) / n, 1)
+        h["fail_rate"] = round(h["fail_rate"] + ((1.0 if failed else 0.0) - h["fail_rate"]) / n, 4)
+        h["runs"] = n
+        self._recorded.add(test_id)
+
+    def save(self) -> None:
+        def merge(doc: dict) -> None:
+            tests = doc.get(self.console)
+            if not isinstance(tests, dict):
+                tests = doc[self.console] = {}
+            for test_id in self._recorded:
+                tests[test_id] = self._tests[test_id]
+
+        try:
+            update_json(self.path, merge)
+        except OSError:
+            pass  # history is an optimization; never fail a run over it
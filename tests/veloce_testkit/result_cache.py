@@ -0,0 +1,143 @@
+"""
+Skip re-running tests whose inputs are byte-identical to a previous pass.
+
+A verdict is a function of the ROM, the emulator build and the test's config
+entry, so a test that PASSed (or failed as an expected KNOWN_FAIL) needs no
+rerun while none of those changed. Entries are grouped per console under a
+build fingerprint (SHA-256 of the veloce binary, this console's core library
+and the shared plugins next to it: bin/cores, bin/plugins); a rebuild that
+changes any of them starts that console's cache afresh. Within a build, a test
+is keyed by the SHA-256 of
+
+    ROM           the test file's bytes
+    golden log    cpu-trace tests only
+    config entry  file, effective frames, detection method, screenshot frame,
+                  reference hash, trace limit, expected verdict
+    run settings  timeout, stop at verdict (--full-frames), test server
+
+Only PASS and KNOWN_FAIL are cached; anything else always reruns. Cached
+results keep their detail text with " (cached)" appended. The cache is local,
+next to the run history:
+    $XDG_CACHE_HOME/veloce/result_cache.json
+    { "<console>": { "build": "<fingerprint>", "tests": { "<key>": {...} } } }
+save() merges only this run's new entries into the file's current contents
+(see util.update_json), so concurrent runs do not drop each other's results.
+
+The fingerprint only sees libraries next to the binary; the binary also scans
+the working directory's cores/ and plugins/ trees, so a core built there can
+change without invalidating anything. The cache is therefore opt-in: --cache
+reads and records it, --force reruns everything but still records passes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from .detect import DetectionResult, TestStatus
+from .util import cache_dir, update_json
+
+_LIB_SUFFIXES = (".so", ".dylib", ".dll")
+
+
+def default_cache_path() -> Path:
+    return cache_dir() / "result_cache.json"
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def build_fingerprint(emulator: Path, console: str) -> str:
+    """Digest of the binary plus the libraries it loads for `console`."""
+    bin_dir = emulator.resolve().parent
+    libs: list[Path] = []
+    cores = bin_dir / "cores"
+    if cores.is_dir():
+        mine = [p for p in cores.iterdir()
+                if p.suffix in _LIB_SUFFIXES and p.stem.removeprefix("lib") == console]
+        # Unknown naming: any core change invalidates every console.
+        libs += mine or [p for p in cores.iterdir() if p.suffix in _LIB_SUFFIXES]
+    plugins = bin_dir / "plugins"
+    if plugins.is_dir():
+        libs += [p for p in plugins.rglob("*") if p.suffix in _LIB_SUFFIXES]
+    h = hashlib.sha256(_file_digest(emulator).encode())
+    for lib in sorted(libs):
+        h.update(f"{lib.relative_to(bin_dir)}:{_file_digest(lib)}".encode())
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        console: str,
+        emulator: Path,
+        path: Path | None = None,
+        *,
+        read: bool = True,
+    ):
+        self.console = console
+        self.path = Path(path) if path else default_cache_path()
+        self.read = read
+        self._digests: dict[Path, str] = {}
+        try:
+            self._doc = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self._doc = {}
+        self.build = build_fingerprint(emulator, console)
+        section = self._doc.get(console)
+        if not isinstance(section, dict) or section.get("build") != self.build:
+            # New build: every old entry is unreachable, so drop them.
+            section = self._doc[console] = {"build": self.build, "tests": {}}
+        self._entries: dict[str, dict] = section["tests"]
+        self._added: dict[str, dict] = {}
+
+    def key(self, test, rom: Path, roms_dir: Path, frames: int, run: tuple = ()) -> str:
+        """`run` holds the harness settings that can change a verdict."""
+        parts = [self._digest(rom)]
+        if test.trace_log and (roms_dir / test.trace_log).exists():
+            parts.append(self._digest(roms_dir / test.trace_log))
+        parts.append(repr((
+            test.file, frames, str(test.result_detection), test.screenshot_frame,
+            test.reference_hash, test.trace_limit, test.expected, run,
+        )))
+        return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[DetectionResult]:
+        e = self._entries.get(key) if self.read else None
+        if e is None:
+            return None
+        return DetectionResult(
+            TestStatus(e["status"]), e["detail"] + " (cached)",
+            e["status_code"], e["progress"],
+        )
+
+    def put(self, key: str, det: DetectionResult) -> None:
+        self._entries[key] = self._added[key] = {
+            "status": det.status.value, "detail": det.detail,
+            "status_code": det.status_code, "progress": det.progress,
+        }
+
+    def save(self) -> None:
+        def merge(doc: dict) -> None:
+            section = doc.get(self.console)
+            if not isinstance(section, dict) or section.get("build") != self.build:
+                # Ours is the build just tested; entries for any other one go.
+                section = doc[self.console] = {"build": self.build, "tests": {}}
+            section.setdefault("tests", {}).update(self._added)
+
+        if not self._added:
+            return
+        try:
+            update_json(self.path, merge)
+        except OSError:
+            pass  # the cache is an optimization; never fail a run over it
+
+    def _digest(self, path: Path) -> str:
+        d = self._digests.get(path)
+        if d is None:
+            d = self._digests[path] = _file_digest(path)
+        return d
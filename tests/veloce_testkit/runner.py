@@ -23,21 +23,39 @@ CLI (identical for every console):
     run_tests.sh cpu ppu         # subset by subsystem or suite id
     run_tests.sh --json          # emit scorecard JSON (consumed by tests/run_all.py)
     run_tests.sh --generate-refs # screenshot-crc: print measured hashes
+    run_tests.sh --save-screenshots  # also write PNGs of failing visual tests
+    run_tests.sh --fail-fast     # stop at the first FAIL/TIMEOUT/ERROR
+    run_tests.sh -j 4            # emulator processes in parallel (default: all cores)
+    run_tests.sh --server        # reuse one `veloce --test-server` per job
+    run_tests.sh --cache         # skip tests whose cached pass still applies
+    run_tests.sh --force         # rerun everything, refreshing the cache
+    run_tests.sh --full-frames   # run every test for its full FRAMES budget
     run_tests.sh -v              # per-test verdict lines
+
+Tests within each suite run fastest / most-recently-failing first, based on the
+timings recorded by previous runs (see history.py; --no-history disables).
+With --cache, tests that passed against the same ROM, build, config entry and
+run settings are not rerun (see result_cache.py; --force reruns but still
+records).
+Memory tests and GBA serial tests end as soon as the core prints its final
+verdict line.
 """
 
 from __future__ import annotations
 
 import argparse
-import json
+import os
 import sys
 from pathlib import Path
 from typing import Callable, Optional
 
 from .schema import load_config
-from .harness import Harness, RunSettings
+from .harness import Harness, RunSettings, HARD_FAIL
+from .history import TestHistory
+from .result_cache import ResultCache
 from .detect import TestStatus
 from .scoring import score_console, render_scorecard, scorecard_to_dict
+from .util import write_json
 
 
 # Console agents supply a callable that ensures ROMs are present and returns the
@@ -59,6 +77,23 @@ def run_console_main(
     ap.add_argument("-v", "--verbose", action="store_true")
     ap.add_argument("--keep", action="store_true", help="keep downloaded ROMs")
     ap.add_argument("--generate-refs", action="store_true")
+    ap.add_argument("--save-screenshots", action="store_true",
+                    help="write PNGs of failing screenshot-crc tests (debug)")
+    ap.add_argument("--fail-fast", action="store_true",
+                    help="stop at the first FAIL/TIMEOUT/ERROR")
+    ap.add_argument("--no-history", action="store_true",
+                    help="run in config order and do not record timings")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="tests to run in parallel (default: CPU count; 1 = serial)")
+    ap.add_argument("--cache", action="store_true",
+                    help="reuse cached passes whose inputs are unchanged, and record new ones")
+    ap.add_argument("--force", action="store_true",
+                    help="rerun every test but record passes in the cache")
+    ap.add_argument("--server", action="store_true",
+                    help="keep one emulator process per job and feed it tests over stdin "
+                         "(consoles in worker.SERVER_CONSOLES; others ignore it)")
+    ap.add_argument("--full-frames", action="store_true",
+                    help="do not stop a test at its final verdict line")
     ap.add_argument("--config", default=str(script_dir / "test_config.json"))
     args = ap.parse_args(argv)
 
@@ -78,25 +113,38 @@ def run_console_main(
         default_frames=cfg.frame_limit,
         default_timeout=cfg.timeout_seconds,
         generate_refs=args.generate_refs,
+        save_screenshots=args.save_screenshots,
+        history=None if args.no_history else TestHistory(console),
+        fail_fast=args.fail_fast,
+        jobs=args.jobs,
+        server=args.server,
+        stop_at_verdict=not args.full_frames,
         console=console,
     )
+    if args.cache or args.force:
+        settings.result_cache = ResultCache(console, settings.emulator, read=not args.force)
     harness = Harness(cfg, settings)
 
     suite_filter = set(args.filters) if args.filters else None
     results = harness.run_all(suite_filter=suite_filter)
+    if settings.history is not None:
+        settings.history.save()
+    if settings.result_cache is not None:
+        settings.result_cache.save()
 
     points = [r.point for r in results if r.point is not None]
     card = score_console(console, points)
 
     if not args.json and args.verbose:
-        for r in results:
-            sym = {
-                TestStatus.PASS: "PASS", TestStatus.FAIL: "FAIL",
-                TestStatus.KNOWN_FAIL: "KNOWN", TestStatus.RUNS: "RUNS",
-                TestStatus.SKIP: "SKIP", TestStatus.TIMEOUT: "TIMEOUT",
-                TestStatus.ERROR: "ERROR",
-            }.get(r.status, "?")
-            print(f"  [{sym:7}] {r.test.id}  {r.detail}")
+        sym = {
+            TestStatus.PASS: "PASS", TestStatus.FAIL: "FAIL",
+            TestStatus.KNOWN_FAIL: "KNOWN", TestStatus.RUNS: "RUNS",
+            TestStatus.SKIP: "SKIP", TestStatus.TIMEOUT: "TIMEOUT",
+            TestStatus.ERROR: "ERROR",
+        }
+        sys.stdout.write("".join(
+            f"  [{sym.get(r.status, '?'):7}] {r.test.id}  {r.detail}\n" for r in results
+        ))
 
     if args.json:
         doc = scorecard_to_dict(card)
@@ -106,7 +154,7 @@ def run_console_main(
              "actual_hash": r.actual_hash}
             for r in results
         ]
-        print(json.dumps(doc, indent=2))
+        write_json(doc)
     else:
         print(render_scorecard(card))
 
@@ -118,6 +166,5 @@ def run_console_main(
                 print(f'  "{f}": "{h}"')
 
     # CI semantics: exit nonzero if any *scored* test failed (known_fail excluded).
-    hard_fail = any(r.status in (TestStatus.FAIL, TestStatus.TIMEOUT, TestStatus.ERROR)
-                    for r in results)
+    hard_fail = any(r.status in HARD_FAIL for r in results)
     return 1 if hard_fail else 0
@@ -59,6 +59,7 @@ TestSpec  (one ROM)
 
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass, field
 from enum import Enum
@@ -101,7 +102,10 @@ DEFAULT_DETECTION = {
 }
 
 
-@dataclass
+_SAFE_NAME_TABLE = str.maketrans("/ ", "__")
+
+
+@dataclass(slots=True)
 class TestSpec:
     id: str
     file: str
@@ -121,6 +125,13 @@ class TestSpec:
     trace_log: str = ""
     trace_limit: int = 0
     raw: dict = field(default_factory=dict)
+    # filesystem-safe form of `id` for per-test artifacts (screenshots, traces).
+    # Not `file`: several tests can share one ROM (e.g. mealybug DMG and CGB
+    # entries) and would overwrite each other's PNG when run in parallel.
+    safe_name: str = field(init=False, repr=False, default="")
+
+    def __post_init__(self):
+        self.safe_name = self.id.translate(_SAFE_NAME_TABLE)
 
 
 @dataclass
@@ -227,8 +238,16 @@ def load_config(path: str | Path, console: Optional[str] = None) -> ConsoleConfi
 
     `console` is inferred from the document's "console" field if not supplied.
     Both top-level "test_suites" and "visual_test_suites" are merged.
+
+    Parses are memoized per (path, console, mtime), so a ROM provider and the
+    runner loading the same file share one parse. Treat the result as read-only.
     """
     path = Path(path)
+    return _load_config_cached(path, console, path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: Path, console: Optional[str], _mtime_ns: int) -> ConsoleConfig:
     with open(path) as f:
         raw = json.load(f)
 
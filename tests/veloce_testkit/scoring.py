@@ -54,6 +54,7 @@ WEIGHTS (tunable, but changing them is a deliberate, reviewed act)
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from operator import attrgetter
 from typing import Iterable
 
 from .schema import AccuracyType, Priority
@@ -101,7 +102,7 @@ CREDIT: dict[TestStatus, float] = {
 EXCLUDED_FROM_SCORE = {TestStatus.KNOWN_FAIL, TestStatus.SKIP, TestStatus.RUNS}
 
 
-@dataclass
+@dataclass(slots=True)
 class TestPoint:
     """A scored datapoint: the inputs to and outputs of score_test()."""
     id: str
@@ -233,7 +234,7 @@ def score_console(console: str, points: Iterable[TestPoint]) -> Scorecard:
     return Scorecard(
         console=console,
         overall=overall,
-        subsystems=sorted(subs.values(), key=lambda x: -x.importance),
+        subsystems=sorted(subs.values(), key=attrgetter("importance"), reverse=True),
         total_tests=len(points),
         total_passed=sum(1 for p in points if p.status == TestStatus.PASS),
         total_failed=sum(1 for p in points if p.status in (TestStatus.FAIL, TestStatus.TIMEOUT, TestStatus.ERROR)),
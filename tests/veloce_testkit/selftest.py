@@ -14,7 +14,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "tests"))
 
 from veloce_testkit.detect import (  # noqa: E402
     detect_blargg_memory, detect_serial_output, detect_gba_register,
-    detect_cpu_trace, TestStatus,
+    detect_cpu_trace, detect_screenshot_crc, TestStatus,
 )
 from veloce_testkit.schema import AccuracyType, Priority  # noqa: E402
 from veloce_testkit.scoring import score_test, score_console  # noqa: E402
@@ -39,6 +39,12 @@ check("serial pass", detect_serial_output("Passed all tests", 0).status == TestS
 check("serial fail", detect_serial_output("Failed #4", 0).status == TestStatus.FAIL)
 check("gba pass", detect_gba_register("[GBA] PASSED", 0).status == TestStatus.PASS)
 check("gba fail#", detect_gba_register("[GBA] FAILED - Failed at test #7", 0).status_code == 7)
+check("fb crc match", detect_screenshot_crc("x\nFRAMEBUFFER_CRC32=1A2B3C4D\n", "1a2b3c4d").status == TestStatus.PASS)
+check("fb crc missing->skip", detect_screenshot_crc("no hash", "1a2b3c4d").status == TestStatus.SKIP)
+_early_pass = "Status code: 0 (PASSED)\n" + "x" * (128 * 1024) + "\nStatus code: 2 (FAILED)\n"
+check("early PASSED beats FAILED in tail",
+      detect_blargg_memory(_early_pass, 0).status == TestStatus.PASS
+      and detect_serial_output(_early_pass, 0).status == TestStatus.PASS)
 
 
 # --- cpu-trace partial credit ---
@@ -80,5 +86,202 @@ card = score_console("nes", [cyc, fail_apu])
 check("console rollup weights importance", 0.60 < card.overall < 0.69)
 check("uncovered subsystems flagged", "ppu" in card.uncovered_subsystems)
 
+
+# --- every config: per-test artifact names never collide ---
+# Parallel jobs write screenshots/traces as <safe_name>.png/.trace.
+from veloce_testkit.schema import load_config  # noqa: E402
+
+for cfg_path in sorted(Path(__file__).resolve().parents[2].glob("cores/*/tests/test_config.json")):
+    names = [t.safe_name for s in load_config(cfg_path).suites for t in s.tests]
+    check(f"{cfg_path.parts[-3]} safe_name unique", len(names) == len(set(names)))
+
+
+# --- SNES ROM walk skips unreadable dirs and symlink loops ---
+import importlib.util  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "snes_test_runner",
+    Path(__file__).resolve().parents[2] / "cores" / "snes" / "tests" / "test_runner.py")
+_snes = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_snes)
+with tempfile.TemporaryDirectory() as d:
+    (Path(d) / "repo" / "sub").mkdir(parents=True)
+    (Path(d) / "repo" / "sub" / "x.sfc").write_bytes(b"rom")
+    (Path(d) / "locked").mkdir()
+    (Path(d) / "locked" / "y.sfc").write_bytes(b"rom")
+    (Path(d) / "repo" / "sub" / "up").symlink_to(d)       # cycle back to the top
+    (Path(d) / "repo" / "self").symlink_to(Path(d) / "repo" / "self")  # ELOOP
+    locked = str(Path(d) / "locked")
+    os.chmod(locked, 0)
+    _real_scandir = os.scandir
+
+    def _scandir(path):  # root ignores mode bits; refuse the way a user would see
+        if os.fspath(path) == locked:
+            raise PermissionError(13, "Permission denied", locked)
+        return _real_scandir(path)
+
+    os.scandir = _scandir
+    try:
+        found = {}
+        _snes._walk_roms(d, found, set())
+    finally:
+        os.scandir = _real_scandir
+        os.chmod(locked, 0o755)
+    check("snes ROM walk skips unreadable dirs and symlink loops", list(found) == ["x.sfc"])
+
+
+# --- run history: fast + recently-failing tests are scheduled first ---
+from types import SimpleNamespace  # noqa: E402
+from veloce_testkit.history import TestHistory  # noqa: E402
+with tempfile.TemporaryDirectory() as d:
+    hist = TestHistory("nes", Path(d) / "h.json")
+    hist.record("slow", 5000.0, False)
+    hist.record("fast", 100.0, False)
+    hist.save()
+    hist = TestHistory("nes", Path(d) / "h.json")
+    order = sorted((SimpleNamespace(id=i) for i in ("new", "slow", "fast")), key=hist.sort_key)
+    check("history orders fastest first, unknown last", [t.id for t in order] == ["fast", "slow", "new"])
+    nes, gb = TestHistory("nes", Path(d) / "h.json"), TestHistory("gb", Path(d) / "h.json")
+    nes.record("new", 50.0, False)
+    gb.record("gb1", 50.0, True)
+    nes.save()
+    gb.save()  # loaded before nes saved; must not drop nes's entries
+    merged = TestHistory("nes", Path(d) / "h.json")
+    check("concurrent history saves merge",
+          merged.mean_ms(SimpleNamespace(id="new")) == 50.0
+          and merged.mean_ms(SimpleNamespace(id="fast")) == 100.0
+          and TestHistory("gb", Path(d) / "h.json").mean_ms(SimpleNamespace(id="gb1")) == 50.0)
+
+# --- parallel run_all keeps plan order ---
+import time  # noqa: E402
+from veloce_testkit.harness import Harness, RunSettings, RunOutput  # noqa: E402
+
+
+class _SleepHarness(Harness):
+    def run_test(self, test, *, known_fail_override=False):
+        time.sleep(test.delay)  # later tests finish first
+        return RunOutput(test=test, status=TestStatus.PASS, detail="")
+
+
+with tempfile.TemporaryDirectory() as d:
+    tests = [SimpleNamespace(id=f"t{i}", delay=0.01 * (4 - i)) for i in range(4)]
+    cfg = SimpleNamespace(console="nes", suites=[SimpleNamespace(id="s", subsystem="cpu", tests=tests)])
+    rs = RunSettings(project_root=Path(d), roms_dir=Path(d), screenshots_dir=Path(d) / "ss",
+                     emulator=Path(d) / "veloce", jobs=4)
+    got = [r.test.id for r in _SleepHarness(cfg, rs).run_all()]
+    check("jobs>1 returns results in plan order", got == ["t0", "t1", "t2", "t3"])
+
+    started = []
+
+    class _StartOrder(_SleepHarness):
+        def run_test(self, test, *, known_fail_override=False):
+            started.append(test.id)
+            return super().run_test(test)
+
+    hist = TestHistory("nes", Path(d) / "h.json")
+    for i, t in enumerate(tests):
+        hist.record(t.id, 100.0 * (i + 1), False)
+    rs.history, rs.jobs = hist, 1
+    serial = [r.test.id for r in _StartOrder(cfg, rs).run_all()]
+    started.clear()
+    rs.jobs = 2
+    par = [r.test.id for r in _StartOrder(cfg, rs).run_all()]
+    check("jobs>1 starts longest first, reports in plan order",
+          set(started[:2]) == {"t3", "t2"} and par == serial == ["t0", "t1", "t2", "t3"])
+
+# --- result cache: a pass is reused only while its inputs are unchanged ---
+from veloce_testkit.result_cache import ResultCache  # noqa: E402
+from veloce_testkit.detect import DetectionResult  # noqa: E402
+
+with tempfile.TemporaryDirectory() as d:
+    d = Path(d)
+    (d / "veloce").write_bytes(b"build-1")
+    (d / "t.nes").write_bytes(b"rom")
+    spec = SimpleNamespace(file="t.nes", trace_log="", result_detection="memory",
+                           screenshot_frame=300, reference_hash="", trace_limit=0,
+                           expected="pass")
+    rc = ResultCache("nes", d / "veloce", d / "rc.json")
+    rc.put(rc.key(spec, d / "t.nes", d, 600), DetectionResult(TestStatus.PASS, "ok", 0, 1.0))
+    rc.save()
+    rc = ResultCache("nes", d / "veloce", d / "rc.json")
+    hit = rc.get(rc.key(spec, d / "t.nes", d, 600))
+    miss_frames = rc.get(rc.key(spec, d / "t.nes", d, 900))
+    miss_run = rc.get(rc.key(spec, d / "t.nes", d, 600, (60, False, False)))
+    (d / "veloce").write_bytes(b"build-2")
+    rebuilt = ResultCache("nes", d / "veloce", d / "rc.json")
+    check("result cache hit / frames, settings, rebuild miss",
+          hit is not None and hit.status == TestStatus.PASS and miss_frames is None
+          and miss_run is None
+          and rebuilt.get(rebuilt.key(spec, d / "t.nes", d, 600)) is None)
+    a, b = ResultCache("nes", d / "veloce", d / "rc.json"), ResultCache("gb", d / "veloce", d / "rc.json")
+    ka, kb = a.key(spec, d / "t.nes", d, 600), b.key(spec, d / "t.nes", d, 700)
+    a.put(ka, DetectionResult(TestStatus.PASS, "ok", 0, 1.0))
+    b.put(kb, DetectionResult(TestStatus.PASS, "ok", 0, 1.0))
+    a.save()
+    b.save()  # loaded before a saved; must not drop a's entry
+    check("concurrent result cache saves merge",
+          ResultCache("nes", d / "veloce", d / "rc.json").get(ka) is not None
+          and ResultCache("gb", d / "veloce", d / "rc.json").get(kb) is not None)
+
+# --- test-server worker splits the merged stream per request ---
+from veloce_testkit.worker import EmulatorWorker, supports_test_server  # noqa: E402
+from veloce_testkit.harness import OUTPUT_CAP  # noqa: E402
+
+check("test server refused for unaudited consoles",
+      not supports_test_server(Path(sys.executable), Path("."), "snes"))
+
+_FAKE_SERVER = r"""
+import json, sys
+for line in sys.stdin:
+    req = json.loads(line)
+    for _ in range(req.get("spam_mb", 0) * 16):
+        sys.stdout.write("x" * 65535 + "\n")
+    print("BLARGG_STATUS: 0x00" if req["rom"] == "ok" else "BLARGG_STATUS: 0x02")
+    if req["rom"] == "die":
+        sys.exit(3)
+    print("VELOCE_TEST_DONE " + json.dumps({"loaded": True, "frames": req["frames"]}), flush=True)
+"""
+with tempfile.TemporaryDirectory() as d:
+    w = EmulatorWorker([sys.executable, "-c", _FAKE_SERVER], Path(d), dict(os.environ), OUTPUT_CAP)
+    try:
+        a = w.submit({"rom": "ok", "frames": 10}, timeout=30)
+        b = w.submit({"rom": "bad", "frames": 10}, timeout=30)
+        big = w.submit({"rom": "ok", "frames": 10, "spam_mb": (OUTPUT_CAP >> 20) + 4}, timeout=60)
+        after = w.submit({"rom": "bad", "frames": 10}, timeout=30)
+        died = w.submit({"rom": "die", "frames": 10, "spam_mb": (OUTPUT_CAP >> 20) + 4}, timeout=60)
+    finally:
+        w.close()
+    check("worker splits output per test",
+          detect_blargg_memory(*a).status == TestStatus.PASS
+          and detect_blargg_memory(*b).status == TestStatus.FAIL
+          and a[0] == "BLARGG_STATUS: 0x00\n")
+    check("worker keeps at most OUTPUT_CAP of a test's output",
+          OUTPUT_CAP - (1 << 16) <= len(big[0]) <= OUTPUT_CAP + 100
+          and big[0].startswith("[... ") and "VELOCE_TEST_DONE" not in big[0]
+          and detect_blargg_memory(*big).status == TestStatus.PASS
+          and after[0] == "BLARGG_STATUS: 0x02\n"
+          and len(died[0]) <= OUTPUT_CAP + 100 and died[1] == 3)
+
+# --- a run stops shortly after the core's final verdict line ---
+from veloce_testkit.harness import run_until_verdict  # noqa: E402
+from veloce_testkit.detect import FINAL_VERDICT_MEMORY  # noqa: E402
+
+_FAKE_CORE = r"""
+import sys, time
+print("Test check #0: $6000=80", file=sys.stderr, flush=True)
+time.sleep(0.1)
+sys.stderr.write("Status code: 0 (PA"); sys.stderr.flush()
+time.sleep(0.1)
+print("SSED)", file=sys.stderr, flush=True)
+time.sleep(30)
+"""
+with tempfile.TemporaryDirectory() as d:
+    t0 = time.monotonic()
+    out, code = run_until_verdict([sys.executable, "-c", _FAKE_CORE], Path(d),
+                                  dict(os.environ), 20, FINAL_VERDICT_MEMORY)
+    check("run stops at final verdict line",
+          time.monotonic() - t0 < 10 and code == 0
+          and detect_blargg_memory(out, code).status == TestStatus.PASS)
+
 print(f"\n{'ALL PASS' if failures == 0 else str(failures) + ' FAILURES'}")
 sys.exit(1 if failures else 0)
@@ -0,0 +1,78 @@
+"""
+Small helpers shared by the testkit and the per-console runners.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+try:  # POSIX: serialize read-merge-write of the shared cache files
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def cache_dir() -> Path:
+    """Per-user cache root for the testkit: $XDG_CACHE_HOME/veloce.
+
+    Falls back to ~/.cache/veloce. History, the result cache and downloaded
+    ROM bundles all live here; the directory may not exist yet.
+    """
+    cache = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(cache) / "veloce"
+
+
+def update_json(path: Path, merge: Callable[[dict], None]) -> None:
+    """Re-read the JSON document at `path`, apply `merge` to it, write it back.
+
+    Several runs can share one cache file (tests/run_all.py, parallel CI jobs),
+    so stores write only what they changed, merged into the file's current
+    contents. On POSIX an flock on "<path>.lock" makes read-merge-write atomic
+    between processes; elsewhere concurrent writers are last-writer-wins. The
+    write itself is a temp file + os.replace, so readers never see half a file.
+    Raises OSError like the file operations it performs.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.ExitStack() as stack:
+        if fcntl is not None:
+            lock = stack.enter_context(open(path.with_name(path.name + ".lock"), "a"))
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+        try:
+            doc = json.loads(path.read_text())
+        except (OSError, ValueError):
+            doc = {}
+        if not isinstance(doc, dict):
+            doc = {}
+        merge(doc)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=path.parent, prefix=path.name, suffix=".tmp", delete=False,
+        ) as tmp:
+            tmp.write(json.dumps(doc))
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+
+try:  # optional: orjson serializes large --json documents several times faster
+    import orjson
+
+    def write_json(obj) -> None:
+        """Write `obj` to stdout as 2-space indented JSON plus a newline."""
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)  # bytes straight out, no decoded copy
+        sys.stdout.buffer.flush()
+except ImportError:
+    def write_json(obj) -> None:
+        """Write `obj` to stdout as 2-space indented JSON plus a newline."""
+        # Raw UTF-8 like orjson; streamed rather than built as one string.
+        json.dump(obj, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
@@ -0,0 +1,183 @@
+"""
+Persistent `veloce --test-server` workers.
+
+Launching the binary per test pays process start, dynamic linking and plugin
+discovery every time, which dominates short Blargg-style ROMs. A worker keeps
+one headless process alive and sends it one JSON request per test:
+
+    {"rom": "/abs/test.nes", "frames": 1800,
+     "save_screenshot": "", "emit_framebuffer_crc": false}
+
+The binary unloads the previous ROM, loads this one, runs the frames, and ends
+that test's output with one line
+
+    VELOCE_TEST_DONE {"loaded": true, "frames": 1800}
+
+stderr is merged into the same pipe, so everything before the marker is the
+test's output and goes to the normal detectors unchanged. A worker that times
+out is killed and transparently restarted on its next request; one that dies
+mid-test reports its exit status like a per-process run would.
+
+A core is only safe to serve this way if everything its verdict depends on is
+reset by load_rom; state that lives until process exit (a function-static
+"already reported" flag, say) silently drops every verdict after the first.
+SERVER_CONSOLES lists the cores audited for that. Other consoles, and builds
+that do not list "test-server" in `veloce --capabilities`, keep one process per
+test (see supports_test_server). Workers need select() on pipes, so they are
+POSIX-only.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+DONE_MARKER = b"VELOCE_TEST_DONE "
+
+# Cores whose test verdict state is all per-ROM (reset by load_rom).
+SERVER_CONSOLES = frozenset({"gb", "gba", "nes"})
+
+
+def supports_test_server(emulator: Path, cwd: Path, console: str) -> bool:
+    if os.name != "posix" or console not in SERVER_CONSOLES:
+        return False
+    try:
+        proc = subprocess.run(
+            [str(emulator), "--capabilities"],
+            capture_output=True, text=True, timeout=10, cwd=str(cwd),
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return "test-server" in proc.stdout.split()
+
+
+class EmulatorWorker:
+    """One `--test-server` process. Like run_until_verdict, it keeps only the
+    last `output_cap` bytes of each test's output; the marker is searched for in
+    each new read plus a few carried-over bytes, never in the whole output."""
+
+    def __init__(self, argv: list[str], cwd: Path, env: dict[str, str], output_cap: int):
+        self.argv = argv
+        self.cwd = cwd
+        self.env = env
+        self.output_cap = output_cap
+        self._proc: Optional[subprocess.Popen] = None
+        self._reset_output()
+
+    def submit(self, request: dict, timeout: float) -> tuple[str, int]:
+        """Run one test; returns (output, exit_code) like subprocess.run would."""
+        if self._proc is None or self._proc.poll() is not None:
+            self._start()
+        proc = self._proc
+        try:
+            proc.stdin.write(json.dumps(request).encode() + b"\n")
+            proc.stdin.flush()
+        except BrokenPipeError:
+            return self._died()
+
+        deadline = time.monotonic() + timeout
+        fd = proc.stdout.fileno()
+        done = self._take_reply()
+        while done is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.close()
+                raise subprocess.TimeoutExpired(self.argv, timeout)
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                return self._died()
+            done = self._take_reply(chunk)
+        output, reply = done
+        return output, 0 if reply.get("loaded") else 1
+
+    def close(self) -> None:
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.kill()
+            self._proc.wait()
+            for pipe in (self._proc.stdin, self._proc.stdout):
+                pipe.close()
+            self._proc = None
+        self._reset_output()
+
+    def _start(self) -> None:
+        self.close()
+        self._proc = subprocess.Popen(
+            self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, cwd=str(self.cwd), env=self.env,
+        )
+
+    def _reset_output(self, rest: bytes = b"") -> None:
+        # Output of the current test: committed chunks (capped) plus a short
+        # uncommitted tail that may still turn out to start the marker line.
+        # The tail begins with a stand-in newline so a marker at the very start
+        # of the output matches the same b"\n" + DONE_MARKER search.
+        self._chunks: deque[bytes] = deque()
+        self._kept = self._dropped = 0
+        self._pending = b"\n" + rest
+        self._lead = True   # _pending[0] is the stand-in, not output
+
+    def _commit(self, data: bytes) -> None:
+        if self._lead and data:
+            data = data[1:]
+            self._lead = False
+        if not data:
+            return
+        self._chunks.append(data)
+        self._kept += len(data)
+        while self._kept - len(self._chunks[0]) >= self.output_cap:
+            n = len(self._chunks.popleft())
+            self._kept -= n
+            self._dropped += n
+
+    def _output(self) -> str:
+        text = b"".join(self._chunks).decode(errors="replace")
+        if self._dropped:
+            text = f"[... {self._dropped} bytes of earlier output dropped ...]\n" + text
+        return text
+
+    def _take_reply(self, chunk: bytes = b"") -> Optional[tuple[str, dict]]:
+        data = self._pending + chunk
+        i = data.find(b"\n" + DONE_MARKER)
+        if i < 0:
+            # A marker line split across reads starts within the last
+            # len(DONE_MARKER) bytes; everything before that is output.
+            keep = len(DONE_MARKER)
+            if len(data) > keep:
+                self._commit(data[:-keep])
+                data = data[-keep:]
+            self._pending = data
+            return None
+        self._commit(data[:i])
+        end = data.find(b"\n", i + 1 + len(DONE_MARKER))
+        if end < 0:
+            self._pending = data[i:]  # reply line not complete yet
+            return None
+        self._commit(data[i:i + 1])   # the newline ending the test's output
+        try:
+            reply = json.loads(data[i + 1 + len(DONE_MARKER):end])
+        except ValueError:
+            reply = {}
+        output = self._output()
+        self._reset_output(data[end + 1:])
+        return output, reply
+
+    def _died(self) -> tuple[str, int]:
+        fd = self._proc.stdout.fileno()
+        self._commit(self._pending)
+        self._pending = b""
+        while chunk := os.read(fd, 1 << 16):
+            self._commit(chunk)
+        code = self._proc.wait()
+        output = self._output()
+        self.close()
+        return output, code if code != 0 else 1